@@ -1,233 +1,181 @@
+import os
 import pygame
 import sys
+from hud import load_font, HudText
+from inputs import read_input
+from frametime import phase
+from profiler import Profiler
+from level_format import LevelFile
+from movie import MovieSession
+from rewind import RewindBuffer
+from timestep import FixedTimestep
+from pipeline import Pipeline
+from smb1_core import SCREEN_WIDTH, SCREEN_HEIGHT, World, step, level_1_1
+from smb1_render import WorldRenderer
+import streaming
 
 # Pygame Setup
 pygame.init()
-SCREEN_WIDTH, SCREEN_HEIGHT = 256, 240  # NES resolution
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Super Mario Bros. 1 Clone")
 clock = pygame.time.Clock()
 FPS = 60
 
-# Colors (approximating SMB1 palette)
-COLOR_BG = (92, 148, 252)       # Sky blue
-COLOR_GROUND = (139, 69, 19)    # Brown dirt
-COLOR_BRICK = (200, 76, 12)     # Brick orange
-COLOR_QBLOCK = (255, 215, 0)    # Question block yellow
-COLOR_COIN = (255, 223, 0)      # Coin gold
-COLOR_PLAYER = (255, 0, 0)      # Mario red
-COLOR_GOOMBA = (139, 69, 19)    # Goomba brown
-COLOR_PIPE = (0, 128, 0)        # Pipe green
-COLOR_FLAGPOLE = (169, 169, 169) # Flagpole gray
-COLOR_FLAG = (255, 255, 255)    # Flag white
-
-# Tile Size
-TILE_SIZE = 16
-
-# Player Class
-class Player:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-        self.vx, self.vy = 0, 0
-        self.speed = 2
-        self.jump_power = -8
-        self.gravity = 0.4
-        self.on_ground = False
-        self.score = 0
-
-    def update(self, platforms):
-        keys = pygame.key.get_pressed()
-        self.vx = 0
-        if keys[pygame.K_LEFT]:
-            self.vx = -self.speed
-        if keys[pygame.K_RIGHT]:
-            self.vx = self.speed
-        if keys[pygame.K_SPACE] and self.on_ground:  # Space to jump
-            self.vy = self.jump_power
-            self.on_ground = False
-
-        self.vy += self.gravity
-        self.rect.x += self.vx
-        self.collide(self.vx, 0, platforms)
-        self.rect.y += self.vy
-        self.on_ground = False
-        self.collide(0, self.vy, platforms)
-
-        if self.rect.y > SCREEN_HEIGHT:
-            self.respawn()
-
-    def respawn(self):
-        self.rect.x, self.rect.y = TILE_SIZE * 2, SCREEN_HEIGHT - TILE_SIZE * 3
-        self.vx, self.vy = 0, 0
-
-    def collide(self, dx, dy, platforms):
-        for p in platforms:
-            if self.rect.colliderect(p.rect):
-                if dx > 0:
-                    self.rect.right = p.rect.left
-                if dx < 0:
-                    self.rect.left = p.rect.right
-                if dy > 0:
-                    self.rect.bottom = p.rect.top
-                    self.vy = 0
-                    self.on_ground = True
-                if dy < 0:
-                    self.rect.top = p.rect.bottom
-                    self.vy = 0
-
-# Platform Class
-class Platform:
-    def __init__(self, x, y, w=TILE_SIZE, h=TILE_SIZE, color=COLOR_BRICK):
-        self.rect = pygame.Rect(x, y, w, h)
-        self.color = color
-
-# Coin Class
-class Coin:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x + 4, y + 4, 8, 8)  # Smaller for coin
-
-# Enemy Class (Goomba)
-class Goomba:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-        self.vx = -1  # Moves left
-    def update(self):
-        self.rect.x += self.vx
-        if self.rect.x < 0 or self.rect.x > 3000:  # Reverse direction at bounds
-            self.vx = -self.vx
-
-# Pipe Class
-class Pipe:
-    def __init__(self, x, y, height):
-        self.rect = pygame.Rect(x, y - (height - 1) * TILE_SIZE, TILE_SIZE * 2, height * TILE_SIZE)
-    def draw(self, screen, scroll_x):
-        pygame.draw.rect(screen, COLOR_PIPE, (self.rect.x - scroll_x, self.rect.y, self.rect.width, self.rect.height))
-
-# Flag Class
-class Flag:
-    def __init__(self, x, y):
-        self.pole = pygame.Rect(x, y - TILE_SIZE * 8, 4, TILE_SIZE * 8)  # Flagpole
-        self.flag = pygame.Rect(x - 8, y - TILE_SIZE * 8, TILE_SIZE, TILE_SIZE)  # Flag
-
-# Level Data for World 1-1 (simplified representation)
-# '#' = ground, 'B' = brick, '?' = question block, 'C' = coin, 'G' = Goomba, 'P' = pipe, 'F' = flag
-level_1_1 = [
-    "........................................................................................",
-    "........................................................................................",
-    "........................................................................................",
-    "........................................................................................",
-    "....?B?B?..C....C......................................................................",
-    "....B...B...............................................................................",
-    "........................................................................................",
-    ".............G..........................................................................",
-    ".....................P2...........................P3............................F..........",
-    "........................................................................................",
-    "........................................................................................",
-    "........................................................................................",
-    "#..#####################....###############.....#################.....###################",
-    "########################################################################################",
-]
-
-def generate_world(level_data):
-    platforms = []
-    coins = []
-    enemies = []
-    pipes = []
-    flag = None
-
-    for y, row in enumerate(level_data):
-        for x, tile in enumerate(row):
-            pos_x = x * TILE_SIZE
-            pos_y = y * TILE_SIZE
-            if tile == '#':
-                platforms.append(Platform(pos_x, pos_y, color=COLOR_GROUND))
-            elif tile == 'B':
-                platforms.append(Platform(pos_x, pos_y, color=COLOR_BRICK))
-            elif tile == '?':
-                platforms.append(Platform(pos_x, pos_y, color=COLOR_QBLOCK))
-            elif tile == 'C':
-                coins.append(Coin(pos_x, pos_y))
-            elif tile == 'G':
-                enemies.append(Goomba(pos_x, pos_y))
-            elif tile == 'P':
-                height = int(row[x+1]) if x+1 < len(row) and row[x+1].isdigit() else 2
-                pipes.append(Pipe(pos_x, pos_y, height))
-            elif tile == 'F':
-                flag = Flag(pos_x, pos_y)
-
-    return platforms, coins, enemies, pipes, flag
-
-# Generate World 1-1
-platforms, coins, enemies, pipes, flag = generate_world(level_1_1)
-
-# Entities
-player = Player(TILE_SIZE * 2, SCREEN_HEIGHT - TILE_SIZE * 3)
-
-# Camera Offset
-scroll_x = 0
+# Loop scheduling: vsync (default), fixed or turbo (TEAMFLAMES_LOOP, see timestep.py)
+timestep = FixedTimestep.from_env(FPS)
+
+# Input recording / replay (TEAMFLAMES_RECORD / TEAMFLAMES_REPLAY, see movie.py)
+movie = MovieSession.from_env()
+
+# Frame profiler overlay and reports (TEAMFLAMES_PROFILE=1, see profiler.py)
+profiler = Profiler.from_env()
+
+# Generate World 1-1 (game logic lives in smb1_core), or a compiled level
+# from TEAMFLAMES_LEVEL (see level_format.py). TEAMFLAMES_STREAM=1 builds the
+# level column by column around the camera instead (see streaming.py).
+level_path = os.environ.get('TEAMFLAMES_LEVEL')
+level = LevelFile(level_path) if level_path else level_1_1
+streamed = os.environ.get('TEAMFLAMES_STREAM') == '1'
+if streamed:
+    world = streaming.StreamingWorld(level)
+else:
+    world = World(level)
+step_world = streaming.step if streamed else step
+player = world.player
+
+renderer = WorldRenderer(world)
+
+# HUD (font loaded once, text re-rendered only when the score changes)
+score_hud = HudText(load_font(None, 24, system=True), "Score: {}")
+
+# Quick savestate slot (F5 saves, F9 loads); streamed worlds have no savestates
+quick_save = None
+savestates = not streamed
+
+# Rewind (hold Backspace); off while a movie is recording or replaying
+rewind = None
+if savestates and movie.recording is None and movie.replay is None:
+    rewind = RewindBuffer(
+        seconds=float(os.environ.get('TEAMFLAMES_REWIND_SECONDS', 10)),
+        fps=FPS,
+        max_bytes=int(os.environ.get('TEAMFLAMES_REWIND_BUDGET', 1 << 20)),
+    )
+
+
+def simulate(controls, rewinding=False):
+    """One simulation step; returns False once the game should stop."""
+    # Rewound frames interpolate from where the player was, like forward ones
+    if timestep.interpolating:
+        renderer.remember()
+    if rewinding:
+        # Step backward one frame per step
+        state = rewind.pop()
+        if state:
+            world.load_state(state)
+        return True
+
+    inputs = movie.input(controls)
+    if movie.quit:
+        return False
+
+    # Update
+    if rewind is not None:
+        rewind.push(world.save_state())
+    if not step_world(world, inputs):
+        print(f"LEVEL COMPLETE! SCORE: {player.score}")
+        return False
+    return True
+
+
+def save_quick():
+    global quick_save
+    quick_save = world.save_state()
+
+
+def load_quick():
+    world.load_state(quick_save)
+
+
+# Pipelined mode (TEAMFLAMES_PIPELINE=1, see pipeline.py): simulate() runs on
+# its own thread and this loop only handles events and draws snapshots, at most
+# TEAMFLAMES_RENDER_FPS times a second. The thread steps at TEAMFLAMES_SIM_RATE,
+# or as fast as it can in turbo mode and for uncapped replays.
+# Streamed worlds load and drop terrain while stepping, so they stay serial.
+pipeline = None
+snapshot_serial = 0
+if os.environ.get('TEAMFLAMES_PIPELINE') == '1' and not streamed:
+    sim_rate = timestep.rate if movie.capped and timestep.mode != 'turbo' else 0
+    pipeline = Pipeline(simulate, renderer.snapshot, sim_rate, controls=(0, False)).start()
+
+
+def run_simulation(fn):
+    """Run fn() between simulation steps."""
+    if pipeline:
+        pipeline.post(fn)
+    else:
+        fn()
+
 
 # Game Loop
 running = True
 while running:
+    phase('events')
     for event in pygame.event.get():
+        if profiler:
+            profiler.handle_event(event)
         if event.type == pygame.QUIT:
             running = False
-
-    # Update
-    player.update(platforms)
-    for enemy in enemies:
-        enemy.update()
-
-    # Coin Collection
-    for coin in coins[:]:
-        if player.rect.colliderect(coin.rect):
-            player.score += 100
-            coins.remove(coin)
-
-    # Enemy Collision
-    for enemy in enemies[:]:
-        if player.rect.colliderect(enemy.rect):
-            if player.vy > 0 and player.rect.bottom > enemy.rect.top:
-                enemies.remove(enemy)
-                player.score += 200
-                player.vy = -5  # Bounce
-            else:
-                player.respawn()
-
-    # Win Condition
-    if flag and player.rect.colliderect(flag.pole):
-        print(f"LEVEL COMPLETE! SCORE: {player.score}")
-        running = False
-
-    # Scroll Camera (only rightward, SMB1 style)
-    if player.rect.x > scroll_x + SCREEN_WIDTH // 2:
-        scroll_x = player.rect.x - SCREEN_WIDTH // 2
-    if scroll_x < 0:
-        scroll_x = 0
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and savestates:
+            run_simulation(save_quick)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and quick_save:
+            run_simulation(load_quick)
+
+    phase('update')
+    rewinding = rewind is not None and pygame.key.get_pressed()[pygame.K_BACKSPACE]
+    if pipeline:
+        pipeline.controls = (read_input(), rewinding)
+        # Wait for the next snapshot, but no longer than one render frame so
+        # events keep flowing; uncapped replays draw every snapshot
+        snapshot, snapshot_serial = pipeline.buffer.wait(
+            snapshot_serial, timestep.render_interval if movie.capped else None)
+        running = running and not pipeline.done
+    else:
+        for _ in timestep.steps():
+            if not simulate(read_input(), rewinding):
+                running = False
+                break
+    if movie.quit:
+        break
+
+    if not movie.render:
+        continue
 
     # Draw
-    screen.fill(COLOR_BG)
-
-    for p in platforms:
-        pygame.draw.rect(screen, p.color, (p.rect.x - scroll_x, p.rect.y, p.rect.width, p.rect.height))
-    for c in coins:
-        pygame.draw.rect(screen, COLOR_COIN, (c.rect.x - scroll_x, c.rect.y, c.rect.width, c.rect.height))
-    for e in enemies:
-        pygame.draw.rect(screen, COLOR_GOOMBA, (e.rect.x - scroll_x, e.rect.y, e.rect.width, e.rect.height))
-    for p in pipes:
-        p.draw(screen, scroll_x)
-    if flag:
-        pygame.draw.rect(screen, COLOR_FLAGPOLE, (flag.pole.x - scroll_x, flag.pole.y, flag.pole.width, flag.pole.height))
-        pygame.draw.rect(screen, COLOR_FLAG, (flag.flag.x - scroll_x, flag.flag.y, flag.flag.width, flag.flag.height))
-    pygame.draw.rect(screen, COLOR_PLAYER, (player.rect.x - scroll_x, player.rect.y, player.rect.width, player.rect.height))
+    phase('draw')
+    if pipeline:
+        renderer.draw_snapshot(screen, snapshot)
+        score = snapshot.score
+    else:
+        renderer.draw(screen, timestep.alpha)
+        score = player.score
 
     # Score Display
-    font = pygame.font.SysFont(None, 24)
-    score_surf = font.render(f"Score: {player.score}", True, (255, 255, 255))
-    screen.blit(score_surf, (10, 10))
+    score_hud.draw(screen, score)
+    if profiler:
+        profiler.draw(screen)
 
+    phase('present')
     pygame.display.flip()
-    clock.tick(FPS)
-
+    if pipeline:
+        # The simulation thread keeps its own schedule; only drawing is capped
+        clock.tick(1.0 / timestep.render_interval if movie.capped else 0)
+    else:
+        timestep.tick(clock, movie.capped)
+
+if pipeline:
+    pipeline.stop()
+movie.close()
+if profiler:
+    profiler.close()
 pygame.quit()
 sys.exit()
@@ -1,12 +1,20 @@
 # test.py
+import os
 import pygame
 import sys
-import struct
 import random
+from sprites import load_sprite
+from hud import load_font, HudText
+from dirty_rects import DirtyRectRenderer
+from inputs import read_input
+from movie import MovieSession
+from frametime import phase
+from profiler import Profiler
+from timestep import FixedTimestep, Interpolator
+from smw_core import SCREEN_WIDTH, SCREEN_HEIGHT, COLOR_SKY, World, step
 
 # Initialize Pygame
 pygame.init()
-SCREEN_WIDTH, SCREEN_HEIGHT = 256, 224
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Super Mario World Clone (RAW)")
 clock = pygame.time.Clock()
@@ -21,16 +29,6 @@ def generate_sprite_data(width, height):
         data.append(value)
     return data
 
-def load_sprite(data, width, height):
-    surface = pygame.Surface((width, height))
-    for y in range(height):
-        for x in range(width):
-            idx = x + y * width
-            value = data[idx]
-            color = (value, value, value) if value > 0 else (0, 0, 0)
-            surface.set_at((x, y), color)
-    return surface
-
 # Sprite data
 player_data = generate_sprite_data(16, 16)
 enemy_data = generate_sprite_data(16, 16)
@@ -46,130 +44,94 @@ goal_sprite = load_sprite(goal_data, 16, 32)
 platform_data = generate_sprite_data(32, 8)
 platform_sprite = load_sprite(platform_data, 32, 8)
 
-# Game entities
-class Player:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 16, 16)
-        self.vx, self.vy = 0, 0
-        self.speed = 2
-        self.jump_power = -8
-        self.gravity = 0.4
-        self.on_ground = False
-        self.score = 0
-
-    def update(self, platforms):
-        keys = pygame.key.get_pressed()
-        self.vx = 0
-        if keys[pygame.K_LEFT]:
-            self.vx = -self.speed
-        if keys[pygame.K_RIGHT]:
-            self.vx = self.speed
-        if keys[pygame.K_SPACE] and self.on_ground:
-            self.vy = self.jump_power
-            self.on_ground = False
-
-        self.vy += self.gravity
-        self.rect.x += self.vx
-        self.collide(self.vx, 0, platforms)
-        self.rect.y += self.vy
-        self.on_ground = False
-        self.collide(0, self.vy, platforms)
-
-        if self.rect.y > SCREEN_HEIGHT:
-            self.rect.x, self.rect.y = 16, 16
-            self.vx, self.vy = 0, 0
-
-    def collide(self, dx, dy, platforms):
-        for p in platforms:
-            if self.rect.colliderect(p.rect):
-                if dx > 0:
-                    self.rect.right = p.rect.left
-                if dx < 0:
-                    self.rect.left = p.rect.right
-                if dy > 0:
-                    self.rect.bottom = p.rect.top
-                    self.vy = 0
-                    self.on_ground = True
-                if dy < 0:
-                    self.rect.top = p.rect.bottom
-                    self.vy = 0
-
-class Platform:
-    def __init__(self, x, y, width=32, height=8):
-        self.rect = pygame.Rect(x, y, width, height)
-
-class Enemy:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 16, 16)
-        self.vx = -1
-
-    def update(self):
-        self.rect.x += self.vx
-        if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
-            self.vx = -self.vx
-
-class Coin:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 8, 8)
-
-class Goal:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 16, 32)
-
-# Level setup
-player = Player(16, 16)
-platforms = [
-    Platform(0, 200, 256, 8),  # Ground
-    Platform(80, 160, 64, 8),
-    Platform(150, 120, 64, 8),
-]
-enemies = [Enemy(100, 184), Enemy(180, 104)]
-coins = [Coin(90, 140), Coin(160, 100), Coin(200, 100)]
-goal = Goal(220, 168)
+# World (game logic lives in smw_core); touching an enemy sends the player back to spawn
+world = World(enemy_respawns=True)
+player = world.player
+platforms, enemies, goal = world.platforms, world.enemies, world.goal
+
+# HUD (font loaded once, text re-rendered only when the score changes)
+score_hud = HudText(load_font(None, 24), "Score: {}")
+
+# Optional dirty-rect mode: sky and platforms never change, so they are drawn
+# once into a background and only moving sprites are redrawn each frame
+renderer = None
+if os.environ.get("TEAMFLAMES_DIRTY_RECTS") == "1":
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    background.fill(COLOR_SKY)
+    for p in platforms:
+        background.blit(platform_sprite, (p.rect.x, p.rect.y))
+    renderer = DirtyRectRenderer(screen, background)
+
+# Input recording / replay (TEAMFLAMES_RECORD / TEAMFLAMES_REPLAY, see movie.py)
+movie = MovieSession.from_env()
+
+# Frame profiler overlay and reports (TEAMFLAMES_PROFILE=1, see profiler.py)
+profiler = Profiler.from_env()
+
+# Loop scheduling: vsync (default), fixed or turbo (TEAMFLAMES_LOOP, see timestep.py)
+timestep = FixedTimestep.from_env(FPS)
+motion = Interpolator()
 
 # Game loop
 running = True
 while running:
+    phase('events')
     for event in pygame.event.get():
+        if profiler:
+            profiler.handle_event(event)
         if event.type == pygame.QUIT:
             running = False
 
-    # Update
-    player.update(platforms)
-    for enemy in enemies:
-        enemy.update()
-    for coin in coins[:]:
-        if player.rect.colliderect(coin.rect):
-            player.score += 10
-            coins.remove(coin)
-    if player.rect.colliderect(goal.rect):
-        print(f"Level Complete! Score: {player.score}")
-        running = False
-
-    for enemy in enemies:
-        if player.rect.colliderect(enemy.rect):
-            player.rect.x, player.rect.y = 16, 16
-            player.vx, player.vy = 0, 0
-            player.score = max(0, player.score - 10)
+    for _ in timestep.steps():
+        phase('update')
+        inputs = movie.input(read_input())
+        if movie.quit:
+            break
+
+        # Update
+        if timestep.interpolating:
+            motion.remember([player] + enemies)
+        if not step(world, inputs):
+            print(f"Level Complete! Score: {player.score}")
+            running = False
+            break
+    if movie.quit:
+        break
+
+    if not movie.render:
+        continue
 
     # Draw
-    screen.fill((92, 148, 252))  # SMW sky blue
-    for p in platforms:
-        screen.blit(platform_sprite, (p.rect.x, p.rect.y))
+    phase('draw')
+    alpha = timestep.alpha
+    if renderer:
+        renderer.clear()
+    else:
+        screen.fill(COLOR_SKY)
+        for p in platforms:
+            screen.blit(platform_sprite, (p.rect.x, p.rect.y))
+    drawn = []
     for e in enemies:
-        screen.blit(enemy_sprite, (e.rect.x, e.rect.y))
-    for c in coins:
-        screen.blit(coin_sprite, (c.rect.x, c.rect.y))
-    screen.blit(goal_sprite, (goal.rect.x, goal.rect.y))
-    screen.blit(player_sprite, (player.rect.x, player.rect.y))
+        drawn.append(screen.blit(enemy_sprite, motion.pos(e, alpha)))
+    for c in world.coins:
+        drawn.append(screen.blit(coin_sprite, (c.rect.x, c.rect.y)))
+    drawn.append(screen.blit(goal_sprite, (goal.rect.x, goal.rect.y)))
+    drawn.append(screen.blit(player_sprite, motion.pos(player, alpha)))
 
     # Score display
-    font = pygame.font.Font(None, 24)
-    score_text = font.render(f"Score: {player.score}", True, (255, 255, 255))
-    screen.blit(score_text, (10, 10))
-
-    pygame.display.flip()
-    clock.tick(FPS)
-
+    drawn.append(score_hud.draw(screen, player.score))
+    if profiler:
+        drawn += profiler.draw(screen)
+
+    phase('present')
+    if renderer:
+        renderer.present(drawn)
+    else:
+        pygame.display.flip()
+    timestep.tick(clock, movie.capped)
+
+movie.close()
+if profiler:
+    profiler.close()
 pygame.quit()
 sys.exit()
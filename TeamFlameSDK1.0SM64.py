@@ -1,5 +1,8 @@
 from ursina import *
 from math import sin, atan2, degrees
+import atexit
+from inputs import held_keys_mask, apply_held_keys
+from movie import MovieSession
 
 # Initialize Ursina app
 app = Ursina()
@@ -78,6 +81,10 @@ for enemy in enemies:
 coin_count = 0
 coin_text = Text(text=f'Coins: {coin_count}', position=(-0.85, 0.45), scale=2)
 
+# Input recording / replay (TEAMFLAMES_RECORD / TEAMFLAMES_REPLAY, see movie.py)
+movie = MovieSession.from_env()
+atexit.register(movie.close)
+
 # Camera setup
 camera.z = -10  # Initial offset
 
@@ -108,6 +115,11 @@ Text(
 def update():
     global coin_count
 
+    # Replayed input replaces the keyboard; either way it is recorded
+    mask = movie.input(held_keys_mask(held_keys))
+    if movie.replay:
+        apply_held_keys(held_keys, mask)
+
     # Player movement
     move_speed = 5
     move_dir = Vec3(held_keys['d'] - held_keys['a'], 0, held_keys['w'] - held_keys['s']).normalized()
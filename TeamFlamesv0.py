@@ -1,5 +1,8 @@
 from ursina import *
 from math import sin, degrees, atan2
+import atexit
+from inputs import held_keys_mask, apply_held_keys
+from movie import MovieSession
 
 # Initialize the Ursina app
 app = Ursina()
@@ -87,6 +90,10 @@ coin_text = Text(text=f'Coins: {coin_count}', position=(-0.85, 0.45), scale=2)
 # Skybox for SM64-like background
 Sky(texture='sky_sunset')   # Optional: use a custom skybox texture
 
+# Input recording / replay (TEAMFLAMES_RECORD / TEAMFLAMES_REPLAY, see movie.py)
+movie = MovieSession.from_env()
+atexit.register(movie.close)
+
 # Camera setup (third-person)
 camera.z = -10              # Initial offset; updated dynamically
 
@@ -94,6 +101,11 @@ camera.z = -10              # Initial offset; updated dynamically
 def update():
     global coin_count
 
+    # Replayed input replaces the keyboard; either way it is recorded
+    mask = movie.input(held_keys_mask(held_keys))
+    if movie.replay:
+        apply_held_keys(held_keys, mask)
+
     # Player movement
     move_speed = 5
     move_dir = Vec3(held_keys['d'] - held_keys['a'], 0, held_keys['w'] - held_keys['s']).normalized()
@@ -0,0 +1,101 @@
+# Runs many headless games across a process pool. Level data is shipped to
+# each worker once, jobs only carry their inputs, and results stream back as
+# chunks of runs finish.
+#
+#   python batch_runner.py --game smb1 --runs 1000 --frames 3000
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import smb1_core
+import recomp_core
+from inputs import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+
+# One run: game is 'smb1' (variant = level name) or 'recomp' (variant = coin
+# seed); inputs holds one bitmask byte per frame
+RunJob = namedtuple('RunJob', 'game variant inputs')
+RunResult = namedtuple('RunResult', 'index score complete_frame deaths frames')
+
+DEFAULT_LEVELS = {'1-1': smb1_core.level_1_1}
+
+# Per-worker level table, filled in by the pool initializer
+_levels = {}
+
+
+def _init_worker(levels):
+    global _levels
+    _levels = levels
+
+
+def run_job(index, job, levels=None):
+    """Run one job to completion in this process."""
+    if job.game == 'smb1':
+        core = smb1_core
+        world = core.World((levels or _levels)[job.variant])
+    elif job.game == 'recomp':
+        core = recomp_core
+        world = core.World(seed=job.variant)
+    else:
+        raise ValueError(f"unknown game {job.game!r}")
+    core.run(world, job.inputs)
+    player = world.player
+    complete_frame = world.frame if world.complete else None
+    return RunResult(index, player.score, complete_frame, player.deaths, world.frame)
+
+
+def _run_chunk(chunk):
+    return [run_job(index, job) for index, job in chunk]
+
+
+def run_batch(jobs, levels=DEFAULT_LEVELS, workers=None, chunksize=8):
+    """Yield a RunResult for every job, in completion order."""
+    indexed = list(enumerate(jobs))
+    chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(levels,)) as pool:
+        futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def random_inputs(frames, rng):
+    """Random held-button input sequence, biased towards running right."""
+    choices = [INPUT_RIGHT, INPUT_RIGHT | INPUT_JUMP, INPUT_RIGHT, INPUT_LEFT, INPUT_JUMP, 0]
+    inputs = bytearray()
+    mask = INPUT_RIGHT
+    for _ in range(frames):
+        if rng.random() < 0.05:
+            mask = rng.choice(choices)
+        inputs.append(mask)
+    return bytes(inputs)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Run random-input headless games on a process pool.")
+    parser.add_argument('--game', choices=['smb1', 'recomp'], default='smb1')
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    variant = '1-1' if args.game == 'smb1' else args.seed
+    jobs = [RunJob(args.game, variant, random_inputs(args.frames, rng)) for _ in range(args.runs)]
+
+    start = time.perf_counter()
+    completed = frames = 0
+    for result in run_batch(jobs, workers=args.workers):
+        completed += result.complete_frame is not None
+        frames += result.frames
+    elapsed = time.perf_counter() - start
+    print(f"{args.runs} runs, {completed} completed, {frames} frames in {elapsed:.2f}s "
+          f"({frames / elapsed:.0f} frames/s)")
+
+
+if __name__ == '__main__':
+    main()
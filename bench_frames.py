@@ -0,0 +1,171 @@
+# Headless frame-time benchmark for the pygame clones. Each game script runs
+# in its own process under the SDL dummy video driver, replaying a scripted
+# input movie (movie.py) at uncapped speed, while the frametime.py phase
+# markers time update and draw for every frame. A run can be stored as a
+# baseline; later runs fail when a phase is slower than baseline * (1 + margin).
+#
+#   python bench_frames.py --frames 600 --save-baseline frames_baseline.json
+#   python bench_frames.py --baseline frames_baseline.json --margin 0.25 --json frames.json
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import frametime
+
+SCRIPTS = (
+    'GPT4.5Mario4k1.04.27.251.0.py',
+    'SMMADVANCEESMW4K.py',
+    '$TEAMFLAMESHDRSMB1-1.py',
+    'TeamFlamesSMB1Recomp.py',
+)
+# Reported phases, each the sum of the frametime.py phases it covers
+PHASES = {
+    'events': ('events',),
+    'update': frametime.UPDATE_PHASES,
+    'draw': ('draw',),
+    'present': ('present',),
+}
+CHECKED_PHASES = ('update', 'draw')
+METRICS = ('mean_us', 'p50_us', 'p99_us')
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def scripted_inputs(frames):
+    """Walk right and back in 90-frame legs, jumping in a steady rhythm.
+
+    The legs keep the single-screen games from reaching their goal, so each
+    script runs for the full frame count.
+    """
+    from inputs import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+    inputs = []
+    for f in range(frames):
+        mask = INPUT_RIGHT if (f // 90) % 2 == 0 else INPUT_LEFT
+        if f % 50 < 15:
+            mask |= INPUT_JUMP
+        inputs.append(mask)
+    return inputs
+
+
+def summarize(samples_ns):
+    if not samples_ns:
+        return None
+    ordered = sorted(samples_ns)
+
+    def pick(pct):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] / 1000
+
+    return {
+        'mean_us': sum(ordered) / len(ordered) / 1000,
+        'p50_us': pick(50),
+        'p99_us': pick(99),
+    }
+
+
+def run_child(script):
+    """Runs inside the benchmark process for one script; prints its stats as JSON."""
+    import runpy
+    recorder = frametime.PhaseRecorder()
+    frametime.install(recorder)
+    try:
+        runpy.run_path(os.path.join(ROOT, script), run_name='__main__')
+    except SystemExit:
+        pass
+    frametime.install(None)
+    stats = {name: summarize(recorder.totals(names)) for name, names in PHASES.items()}
+    stats['frames'] = len(recorder.frames)
+    print(json.dumps(stats))
+
+
+def bench_script(script, movie_path, timeout):
+    env = dict(os.environ)
+    env.update({
+        'SDL_VIDEODRIVER': 'dummy',
+        'SDL_AUDIODRIVER': 'dummy',
+        'PYGAME_HIDE_SUPPORT_PROMPT': '1',
+        'TEAMFLAMES_REPLAY': movie_path,
+        'TEAMFLAMES_REPLAY_MODE': 'uncapped',
+    })
+    env.pop('TEAMFLAMES_RECORD', None)
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', script],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"{script} failed:\n{proc.stderr}")
+    return json.loads(lines[-1])
+
+
+def compare(results, baseline, margin, metric):
+    """Return a message for every checked phase slower than baseline * (1 + margin)."""
+    failures = []
+    for script, stats in results.items():
+        base = baseline.get('results', {}).get(script)
+        if not base:
+            continue
+        for name in CHECKED_PHASES:
+            if not stats.get(name) or not base.get(name):
+                continue
+            now, before = stats[name][metric], base[name][metric]
+            if now > before * (1 + margin):
+                failures.append(f"{script} {name} {metric}: {now:.1f} us vs baseline {before:.1f} us "
+                                f"({(now / before - 1) * 100:+.0f}%, margin {margin * 100:.0f}%)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless per-game frame-time benchmark.")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--scripts', nargs='*', default=list(SCRIPTS))
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--baseline', help="compare against this results file")
+    parser.add_argument('--save-baseline', help="also write the results to this baseline file")
+    parser.add_argument('--margin', type=float, default=0.25, help="allowed slowdown as a fraction (default 0.25)")
+    parser.add_argument('--metric', choices=METRICS, default='mean_us')
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    from movie import Movie
+    movie = Movie(seed=0)
+    for mask in scripted_inputs(args.frames):
+        movie.append(mask)
+
+    results = {}
+    print(f"{'script':<32} {'frames':>6} {'upd mean':>9} {'upd p50':>9} {'upd p99':>9} "
+          f"{'drw mean':>9} {'drw p50':>9} {'drw p99':>9}   (us)")
+    with tempfile.TemporaryDirectory() as workdir:
+        movie_path = os.path.join(workdir, 'bench.tfm')
+        movie.save(movie_path)
+        for script in args.scripts:
+            stats = bench_script(script, movie_path, args.timeout)
+            results[script] = stats
+            cells = []
+            for name in CHECKED_PHASES:
+                phase_stats = stats.get(name) or {}
+                cells += [f"{phase_stats.get(metric, float('nan')):9.1f}" for metric in METRICS]
+            print(f"{script:<32} {stats['frames']:>6} " + ' '.join(cells))
+
+    report = {'frames': args.frames, 'results': results}
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.margin, args.metric)
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+        if failures:
+            sys.exit(1)
+        print(f"no regressions beyond {args.margin * 100:.0f}% ({args.metric})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# Scaling benchmark for the World 1-1 engine on procedural levels (levelgen.py).
+# For each level length it reports load time and per-frame update and draw
+# time, for the full World and for the streaming world. Everything runs
+# offscreen; no window is opened.
+#
+#   python bench_levels.py --sizes 100,10000,1000000 --frames 600 --json levels.json
+import argparse
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+import smb1_core
+import streaming
+from inputs import INPUT_RIGHT, INPUT_JUMP
+from level_format import LevelFile, save_level
+from levelgen import generate_level
+from smb1_render import WorldRenderer
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000, 1000000)
+
+
+def scripted_inputs(frames):
+    """Run right, jumping in a steady rhythm."""
+    return [INPUT_RIGHT | (INPUT_JUMP if f % 30 < 25 else 0) for f in range(frames)]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(samples_ns):
+    """Mean and p99 in microseconds."""
+    return {
+        'mean_us': sum(samples_ns) / len(samples_ns) / 1000,
+        'p99_us': percentile(samples_ns, 99) / 1000,
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def measure_frames(world, step, inputs):
+    screen = pygame.Surface((smb1_core.SCREEN_WIDTH, smb1_core.SCREEN_HEIGHT))
+    renderer = WorldRenderer(world)
+    update, draw = [], []
+    clock = time.perf_counter_ns
+    for mask in inputs:
+        start = clock()
+        running = step(world, mask)
+        middle = clock()
+        renderer.draw(screen)
+        end = clock()
+        update.append(middle - start)
+        draw.append(end - middle)
+        if not running:
+            break
+    return {'update': summarize(update), 'draw': summarize(draw), 'frames': len(update)}
+
+
+def bench_size(columns, seed, frames, max_full, workdir):
+    result = {'columns': columns}
+    level, result['generate_s'] = timed(generate_level, columns, seed)
+    inputs = scripted_inputs(frames)
+
+    path = os.path.join(workdir, f'level-{columns}.tflv')
+    _, result['compile_s'] = timed(save_level, level, path)
+    compiled, result['open_compiled_s'] = timed(LevelFile, path)
+
+    if columns <= max_full:
+        world, result['load_full_s'] = timed(smb1_core.World, level)
+        result['full'] = measure_frames(world, smb1_core.step, inputs)
+        del world
+
+    world, result['load_stream_s'] = timed(streaming.StreamingWorld, compiled)
+    result['stream'] = measure_frames(world, streaming.step, inputs)
+    del world
+    compiled.close()
+    return result
+
+
+def print_row(result):
+    def cell(mode, phase):
+        stats = result.get(mode)
+        return f"{stats[phase]['mean_us']:9.1f}" if stats else f"{'-':>9}"
+    load_full = result.get('load_full_s')
+    load_full = f"{load_full * 1000:10.1f}" if load_full is not None else f"{'-':>10}"
+    print(f"{result['columns']:>9} {result['generate_s'] * 1000:9.1f} {load_full} "
+          f"{result['load_stream_s'] * 1000:10.2f} "
+          f"{cell('full', 'update')} {cell('full', 'draw')} {cell('stream', 'update')} {cell('stream', 'draw')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load/update/draw time against level length.")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated level lengths in columns")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-full', type=int, default=100000,
+                        help="longest level to also load as a full World (it keeps every tile in memory)")
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    print(f"{'columns':>9} {'gen ms':>9} {'full ms':>10} {'stream ms':>10} "
+          f"{'full upd':>9} {'full drw':>9} {'strm upd':>9} {'strm drw':>9}   (per-frame means in us)")
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for columns in sizes:
+            result = bench_size(columns, args.seed, args.frames, args.max_full, workdir)
+            results.append(result)
+            print_row(result)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'frames': args.frames, 'seed': args.seed, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
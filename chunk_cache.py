@@ -0,0 +1,42 @@
+from collections import OrderedDict
+
+import pygame
+
+
+# Pre-rendered static terrain, cut into fixed-width column chunks. Chunks are
+# rendered on first use by render(surface, left) and kept in an LRU cache, so
+# a frame only blits the one or two chunks under the camera.
+class ChunkCache:
+    def __init__(self, render, height, chunk_width=256, capacity=4):
+        self.render = render
+        self.height = height
+        self.chunk_width = chunk_width
+        self.capacity = capacity
+        self.chunks = OrderedDict()  # chunk index -> Surface
+
+    def get(self, index):
+        surface = self.chunks.get(index)
+        if surface is not None:
+            self.chunks.move_to_end(index)
+            return surface
+        surface = pygame.Surface((self.chunk_width, self.height))
+        self.render(surface, index * self.chunk_width)
+        self.chunks[index] = surface
+        if len(self.chunks) > self.capacity:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def invalidate(self, rect):
+        """Drop the chunks covering rect so they are re-rendered on next use."""
+        for index in range(rect.left // self.chunk_width, (rect.right - 1) // self.chunk_width + 1):
+            self.chunks.pop(index, None)
+
+    def clear(self):
+        self.chunks.clear()
+
+    def draw(self, screen, scroll_x):
+        width = self.chunk_width
+        first = scroll_x // width
+        last = (scroll_x + screen.get_width() - 1) // width
+        for index in range(first, last + 1):
+            screen.blit(self.get(index), (index * width - scroll_x, 0))
@@ -0,0 +1,79 @@
+# Index for coins and other pickups. Items are bucketed in a uniform grid by
+# the cells their .rect covers; every bucket is a dict, so removing an item is
+# O(1), and collecting only looks at the cells under the player. Iteration
+# follows insertion order, so the index can stand in for a plain coin list.
+class Collectibles:
+    def __init__(self, items=(), cell_size=32):
+        self.cell_size = cell_size
+        self.buckets = {}  # (col, row) -> {item: None}
+        self.cells = {}  # item -> cells it is bucketed under
+        self.top = self.bottom = 0  # vertical extent of everything added
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __contains__(self, item):
+        return item in self.cells
+
+    def cells_for(self, left, top, right, bottom):
+        size = self.cell_size
+        return [(col, row)
+                for col in range(left // size, (right - 1) // size + 1)
+                for row in range(top // size, (bottom - 1) // size + 1)]
+
+    def add(self, item):
+        rect = item.rect
+        if not self.cells:
+            self.top, self.bottom = rect.top, rect.bottom
+        else:
+            self.top, self.bottom = min(self.top, rect.top), max(self.bottom, rect.bottom)
+        cells = self.cells_for(rect.left, rect.top, rect.right, rect.bottom)
+        for cell in cells:
+            self.buckets.setdefault(cell, {})[item] = None
+        self.cells[item] = cells
+
+    def remove(self, item):
+        for cell in self.cells.pop(item):
+            bucket = self.buckets[cell]
+            del bucket[item]
+            if not bucket:
+                del self.buckets[cell]
+
+    def query(self, rect):
+        """Return the items colliding with rect."""
+        found = {}
+        buckets = self.buckets
+        for cell in self.cells_for(rect.left, rect.top, rect.right, rect.bottom):
+            bucket = buckets.get(cell)
+            if bucket:
+                for item in bucket:
+                    if rect.colliderect(item.rect):
+                        found[item] = None
+        return list(found)
+
+    def collect(self, rect):
+        """Remove and return the items colliding with rect."""
+        found = self.query(rect)
+        for item in found:
+            self.remove(item)
+        return found
+
+    def visible(self, left, right):
+        """Return the items overlapping the columns [left, right)."""
+        if not self.cells:
+            return []
+        found = {}
+        buckets = self.buckets
+        for cell in self.cells_for(left, self.top, right, self.bottom):
+            bucket = buckets.get(cell)
+            if bucket:
+                for item in bucket:
+                    rect = item.rect
+                    if rect.right > left and rect.left < right:
+                        found[item] = None
+        return list(found)
@@ -0,0 +1,90 @@
+import bisect
+
+
+# Entities sorted by the left edge of their rect, so the draw loops can bisect
+# straight to the ones inside the camera view. Entities wider than `span` are
+# indexed once per span-wide slice, which keeps the lookback bounded for long
+# merged terrain; such wide entities are expected to stay put.
+#
+# Moving entities only shift by a few pixels per frame, so after they move the
+# caller marks the index stale with moved(), and the order is repaired by an
+# insertion pass the next time visible() needs it. Headless runs that never
+# draw never pay for it.
+class XIndex:
+    def __init__(self, entities=(), span=256):
+        self.span = span
+        self.keys = []
+        self.entities = []
+        self.slots = {}  # entity -> keys it is indexed under
+        self.stale = False
+        self.rebuild(entities)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def slice_keys(self, rect):
+        if rect.width <= self.span:
+            return [rect.left]
+        return list(range(rect.left, rect.right, self.span))
+
+    def rebuild(self, entities):
+        pairs = []
+        self.slots = {}
+        for entity in entities:
+            keys = self.slice_keys(entity.rect)
+            self.slots[entity] = keys
+            pairs.extend((key, entity) for key in keys)
+        pairs.sort(key=lambda pair: pair[0])
+        self.keys = [key for key, _ in pairs]
+        self.entities = [entity for _, entity in pairs]
+        self.stale = False
+
+    def moved(self):
+        """Note that entities have changed position; the order is fixed lazily."""
+        self.stale = True
+
+    def refresh(self):
+        """Re-sort after moving entities have changed position."""
+        keys, entities, slots = self.keys, self.entities, self.slots
+        # Insertion sort: nearly free when entities only moved a little
+        for i, entity in enumerate(entities):
+            key = keys[i]
+            if len(slots[entity]) == 1 and entity.rect.left != key:
+                key = entity.rect.left  # Wide entities stay put
+                slots[entity] = [key]
+            j = i
+            while j and keys[j - 1] > key:
+                keys[j] = keys[j - 1]
+                entities[j] = entities[j - 1]
+                j -= 1
+            keys[j] = key
+            entities[j] = entity
+        self.stale = False
+
+    def add(self, entity):
+        keys = self.slice_keys(entity.rect)
+        self.slots[entity] = keys
+        for key in keys:
+            i = bisect.bisect_right(self.keys, key)
+            self.keys.insert(i, key)
+            self.entities.insert(i, entity)
+
+    def remove(self, entity):
+        for key in self.slots.pop(entity):
+            i = bisect.bisect_left(self.keys, key)
+            while self.entities[i] is not entity:
+                i += 1
+            del self.keys[i]
+            del self.entities[i]
+
+    def visible(self, left, right):
+        """Return the entities overlapping the columns [left, right)."""
+        if self.stale:
+            self.refresh()
+        i = bisect.bisect_left(self.keys, left - self.span)
+        j = bisect.bisect_left(self.keys, right)
+        found = {}
+        for entity in self.entities[i:j]:
+            if entity.rect.right > left:
+                found[entity] = None
+        return list(found)
@@ -0,0 +1,31 @@
+import pygame
+
+
+# Dirty-rectangle presenter for static-camera scenes. Each frame the areas
+# drawn last frame are restored from a cached background, the moving things
+# are drawn, and only the old and new rects are pushed to the display.
+class DirtyRectRenderer:
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.previous = []
+        self.redraw_all = True
+
+    def invalidate(self):
+        """Force a full redraw, e.g. after the background changed."""
+        self.redraw_all = True
+
+    def clear(self):
+        if self.redraw_all:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
+
+    def present(self, rects):
+        if self.redraw_all:
+            pygame.display.flip()
+            self.redraw_all = False
+        else:
+            pygame.display.update(self.previous + rects)
+        self.previous = rects
@@ -0,0 +1,168 @@
+# Archetype-based entity storage. Each archetype (coin, goomba, ...) keeps its
+# components in typed NumPy columns, one row per entity, so an entity costs a
+# few bytes per component instead of a Python object with a Rect and a
+# __dict__. Systems update a whole archetype with array operations, and
+# removal swaps the last row into the hole so columns stay dense.
+# smb1_core and streaming keep their Goombas here.
+import numpy as np
+
+# Standard components: dtype, values per entity
+COMPONENTS = {
+    'pos': (np.int32, 2),
+    'vel': (np.int32, 2),
+    'size': (np.int16, 2),
+    'frame': (np.uint8, 1),
+    'color': (np.uint8, 3),
+}
+
+
+class Archetype:
+    def __init__(self, name, components, capacity=16):
+        self.name = name
+        self.components = tuple(components)
+        self.count = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.columns = {}
+        for component in self.components:
+            dtype, width = COMPONENTS[component]
+            shape = (capacity, width) if width > 1 else (capacity,)
+            self.columns[component] = np.zeros(shape, dtype=dtype)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, component):
+        """Live view of one column, trimmed to the current entities."""
+        return self.columns[component][:self.count]
+
+    @property
+    def capacity(self):
+        return len(self.ids)
+
+    def reserve(self, count):
+        if count <= self.capacity:
+            return
+        capacity = max(count, self.capacity * 2)
+        ids = np.zeros(capacity, dtype=self.ids.dtype)
+        ids[:self.count] = self.ids[:self.count]
+        self.ids = ids
+        for component, column in self.columns.items():
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[component] = grown
+
+    def extend(self, ids, values):
+        """Append rows for ids; values maps component -> per-entity values (or one shared value)."""
+        start, end = self.count, self.count + len(ids)
+        self.reserve(end)
+        self.ids[start:end] = ids
+        for component, column in self.columns.items():
+            column[start:end] = values.get(component, 0)
+        self.count = end
+        return start
+
+    def swap_remove(self, row):
+        """Remove a row by moving the last row into it; returns the moved entity id or None."""
+        last = self.count - 1
+        moved = None
+        if row != last:
+            moved = int(self.ids[last])
+            self.ids[row] = self.ids[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.count = last
+        return moved
+
+
+class EntityStore:
+    def __init__(self):
+        self.archetypes = {}
+        self.kinds = []  # archetype per kind index
+        # Entity id -> (kind index, row); kind -1 marks a removed entity
+        self.kind_of = np.zeros(0, dtype=np.int16)
+        self.row_of = np.zeros(0, dtype=np.int32)
+        self.next_id = 0
+
+    def __len__(self):
+        return sum(len(a) for a in self.kinds)
+
+    def __contains__(self, entity):
+        return 0 <= entity < self.next_id and self.kind_of[entity] >= 0
+
+    def __getitem__(self, name):
+        return self.archetypes[name]
+
+    def archetype(self, name, components):
+        archetype = self.archetypes.get(name)
+        if archetype is None:
+            archetype = Archetype(name, components)
+            archetype.kind = len(self.kinds)
+            self.archetypes[name] = archetype
+            self.kinds.append(archetype)
+        return archetype
+
+    def spawn(self, name, **values):
+        return int(self.spawn_many(name, 1, **values)[0])
+
+    def spawn_many(self, name, count, **values):
+        """Add count entities to an existing archetype in one go; returns their ids."""
+        archetype = self.archetypes[name]
+        ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        end = self.next_id + count
+        if end > len(self.kind_of):
+            capacity = max(end, len(self.kind_of) * 2, 64)
+            # Ids past next_id were never spawned, so they grow as removed (-1)
+            kind_of = np.full(capacity, -1, dtype=self.kind_of.dtype)
+            kind_of[:self.next_id] = self.kind_of[:self.next_id]
+            row_of = np.zeros(capacity, dtype=self.row_of.dtype)
+            row_of[:self.next_id] = self.row_of[:self.next_id]
+            self.kind_of, self.row_of = kind_of, row_of
+        start = archetype.extend(ids, values)
+        self.kind_of[self.next_id:end] = archetype.kind
+        self.row_of[self.next_id:end] = np.arange(start, start + count)
+        self.next_id = end
+        return ids
+
+    def despawn(self, entity):
+        if entity not in self:
+            raise KeyError(entity)
+        kind = self.kind_of[entity]
+        moved = self.kinds[kind].swap_remove(self.row_of[entity])
+        if moved is not None:
+            self.row_of[moved] = self.row_of[entity]
+        self.kind_of[entity] = -1
+
+    def despawn_many(self, entities):
+        for entity in entities:
+            self.despawn(int(entity))
+
+    def get(self, entity, component):
+        if entity not in self:
+            raise KeyError(entity)
+        kind = self.kind_of[entity]
+        return self.kinds[kind].columns[component][self.row_of[entity]]
+
+
+# Systems: each runs over one whole archetype
+
+def patrol(archetype, low, high):
+    """Walk along x and turn around once outside [low, high] (Goomba movement)."""
+    pos, vel = archetype['pos'], archetype['vel']
+    pos[:, 0] += vel[:, 0]
+    turn = (pos[:, 0] < low) | (pos[:, 0] > high)
+    vel[turn, 0] *= -1
+
+
+def overlapping(archetype, rect):
+    """Ids of the entities whose pos/size box overlaps rect (x, y, w, h)."""
+    x, y, w, h = rect
+    pos, size = archetype['pos'], archetype['size']
+    hit = ((pos[:, 0] < x + w) & (x < pos[:, 0] + size[:, 0]) &
+           (pos[:, 1] < y + h) & (y < pos[:, 1] + size[:, 1]))
+    return archetype.ids[:archetype.count][hit]
+
+
+def visible(archetype, left, right):
+    """Row indexes of the entities that overlap the x range [left, right)."""
+    pos, size = archetype['pos'], archetype['size']
+    return np.flatnonzero((pos[:, 0] < right) & (pos[:, 0] + size[:, 0] > left))
@@ -0,0 +1,60 @@
+# Frame phase markers for the game loops. A loop calls phase('events'),
+# phase('update'), phase('draw') and phase('present') as it enters each part
+# of a frame (update is further split into 'player' and 'entities'); a phase
+# lasts until the next marker. Nothing is timed unless a tool installs a
+# recorder, so the markers cost one global check when off. Only markers from
+# the thread that installed the recorder are timed (pipeline.py steps the game
+# on a second thread).
+import threading
+import time
+
+_recorder = None
+_thread = None
+
+
+def phase(name):
+    if _recorder is not None and threading.get_ident() == _thread:
+        _recorder(name, time.perf_counter_ns())
+
+
+def install(recorder):
+    """Route phase markers to recorder(name, now_ns); None turns timing off. Returns the previous recorder."""
+    global _recorder, _thread
+    previous, _recorder = _recorder, recorder
+    _thread = threading.get_ident()
+    return previous
+
+
+# Phases that make up the update part of a frame; the game cores mark
+# 'player' and 'entities' inside step()
+UPDATE_PHASES = ('update', 'player', 'entities')
+
+
+# Collects per-frame phase times in nanoseconds. A frame starts at each
+# frame_phase marker; end_frame() receives {phase: ns} for every finished frame.
+class PhaseRecorder:
+    def __init__(self, frame_phase='events'):
+        self.frame_phase = frame_phase
+        self.frames = []
+        self.frame = None
+        self.current = None
+        self.started = 0
+
+    def __call__(self, name, now):
+        if self.current is not None:
+            frame = self.frame
+            frame[self.current] = frame.get(self.current, 0) + now - self.started
+        if name == self.frame_phase or self.frame is None:
+            if self.frame:
+                self.end_frame(self.frame)
+            self.frame = {}
+        self.current = name
+        self.started = now
+
+    def end_frame(self, frame):
+        self.frames.append(frame)
+
+    def totals(self, names):
+        """Per-frame time spent in any of names, for the frames that had them."""
+        return [sum(frame.get(name, 0) for name in names)
+                for frame in self.frames if any(name in frame for name in names)]
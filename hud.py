@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+import pygame
+
+# Fonts are loaded once per (name, size, kind) and shared
+_fonts = {}
+
+
+def load_font(name=None, size=24, system=False):
+    """Return a shared Font; system=True goes through pygame.font.SysFont."""
+    key = (name, size, system)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(name, size) if system else pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+
+# LRU cache of rendered strings for one font and color
+class TextCache:
+    def __init__(self, font, color=(255, 255, 255), antialias=True, capacity=64):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+
+    def render(self, text):
+        surface = self.surfaces.get(text)
+        if surface is not None:
+            self.surfaces.move_to_end(text)
+            return surface
+        surface = self.font.render(text, self.antialias, self.color)
+        self.surfaces[text] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+# A HUD line such as "Score: {}" that is only re-rendered when its value changes
+class HudText:
+    def __init__(self, font, template, pos=(10, 10), color=(255, 255, 255)):
+        self.font = font
+        self.template = template
+        self.pos = pos
+        self.color = color
+        self.value = None
+        self.surface = None
+
+    def draw(self, screen, value):
+        if self.surface is None or value != self.value:
+            self.value = value
+            self.surface = self.font.render(self.template.format(value), True, self.color)
+        return screen.blit(self.surface, self.pos)
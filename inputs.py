@@ -0,0 +1,48 @@
+# Controller bitmask, same layout as the INPUT_* defines in TeamFlamesHDRSM64.py
+INPUT_LEFT = 0x01
+INPUT_RIGHT = 0x02
+INPUT_UP = 0x04
+INPUT_DOWN = 0x08
+INPUT_JUMP = 0x10  # Extension: the jump button (A)
+
+# Ursina held_keys names for each bit
+URSINA_KEYS = {'a': INPUT_LEFT, 'd': INPUT_RIGHT, 'w': INPUT_UP, 's': INPUT_DOWN, 'space': INPUT_JUMP}
+
+
+def keyboard_mask(keys, jump_key=None):
+    """Pack a pygame.key.get_pressed() result into an input bitmask."""
+    import pygame
+    if jump_key is None:
+        jump_key = pygame.K_SPACE
+    mask = 0
+    if keys[pygame.K_LEFT]:
+        mask |= INPUT_LEFT
+    if keys[pygame.K_RIGHT]:
+        mask |= INPUT_RIGHT
+    if keys[pygame.K_UP]:
+        mask |= INPUT_UP
+    if keys[pygame.K_DOWN]:
+        mask |= INPUT_DOWN
+    if keys[jump_key]:
+        mask |= INPUT_JUMP
+    return mask
+
+
+def read_input(jump_key=None):
+    import pygame
+    return keyboard_mask(pygame.key.get_pressed(), jump_key)
+
+
+def held_keys_mask(held_keys):
+    """Pack Ursina's held_keys into an input bitmask."""
+    mask = 0
+    for key, bit in URSINA_KEYS.items():
+        if held_keys[key]:
+            mask |= bit
+    return mask
+
+
+def apply_held_keys(held_keys, mask):
+    """Overwrite Ursina's held_keys from an input bitmask (for replays)."""
+    for key, bit in URSINA_KEYS.items():
+        held_keys[key] = 1 if mask & bit else 0
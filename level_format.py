@@ -0,0 +1,177 @@
+# Packed binary level format. A compiled level is a header, a column-major
+# tile array (one ASCII byte per cell, '.' for empty), an entity table sorted
+# by column and the solid tiles already merged into rectangles (merge_tiles()
+# order). LevelFile maps it with mmap, so loading does no parsing and
+# processes that open the same level share its pages.
+#
+#   python level_format.py level.txt level.tflv   compile a text level (one row per line)
+#   python level_format.py - world_1_1.tflv       compile the built-in World 1-1
+import argparse
+import mmap
+import re
+import struct
+
+from tilegrid import merge_tiles
+
+LEVEL_MAGIC = b'TFLV'
+LEVEL_VERSION = 2
+LEVEL_HEADER = struct.Struct('<4sHIHII')  # magic, version, columns, rows, entity count, rect count
+ENTITY = struct.Struct('<IHcB')  # column, row, kind, parameter (pipe height)
+RECT = struct.Struct('<IHIHc')  # column, row, width, height, tile
+
+SOLID_TILES = b'#B?'
+DEFAULT_PIPE_HEIGHT = 2
+EMPTY = b'.'
+
+_ENTITY = re.compile('[CGPF]')
+# Maps everything but solid tiles to empty
+_SOLID_ONLY = bytes(c if c in SOLID_TILES else EMPTY[0] for c in range(256))
+
+
+def parse_entities(level_data):
+    """Yield (column, row, kind, parameter) for each entity in an ASCII level."""
+    for y, row in enumerate(level_data):
+        for match in _ENTITY.finditer(row):
+            x, tile = match.start(), match.group()
+            param = 0
+            if tile == 'P':
+                param = int(row[x+1]) if x+1 < len(row) and row[x+1].isdigit() else DEFAULT_PIPE_HEIGHT
+            yield x, y, tile, param
+
+
+def compile_level(level_data):
+    """Compile an ASCII level (list of row strings) into the binary format."""
+    cols, rows = max(len(row) for row in level_data), len(level_data)
+    tiles = bytearray(cols * rows)
+    for y, row in enumerate(level_data):
+        # Row y is every rows-th byte of the column-major array
+        tiles[y::rows] = row.ljust(cols, '.').encode('ascii').translate(_SOLID_ONLY)
+    entities = sorted(parse_entities(level_data))
+    rects = merge_tiles({(x, y): tile for y, row in enumerate(level_data)
+                         for x, tile in enumerate(row) if tile in '#B?'})
+    parts = [LEVEL_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, cols, rows, len(entities), len(rects)), bytes(tiles)]
+    parts.extend(ENTITY.pack(x, y, kind.encode('ascii'), param) for x, y, kind, param in entities)
+    parts.extend(RECT.pack(x, y, w, h, tile.encode('ascii')) for x, y, w, h, tile in rects)
+    return b''.join(parts)
+
+
+def save_level(level_data, path):
+    with open(path, 'wb') as f:
+        f.write(compile_level(level_data))
+
+
+class LevelFile:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.cols, self.rows, self.entity_count, self.rect_count = LEVEL_HEADER.unpack_from(self.data)
+        if magic != LEVEL_MAGIC or version != LEVEL_VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a compiled TeamFlames level (version {LEVEL_VERSION})")
+        self.tile_offset = LEVEL_HEADER.size
+        self.entity_offset = self.tile_offset + self.cols * self.rows
+        self.rect_offset = self.entity_offset + self.entity_count * ENTITY.size
+        if len(self.data) != self.rect_offset + self.rect_count * RECT.size:
+            self.data.close()
+            raise ValueError(f"{path} is truncated")
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def column(self, col):
+        """Tile bytes of one column, top to bottom."""
+        start = self.tile_offset + col * self.rows
+        return self.data[start:start + self.rows]
+
+    def tile(self, col, row):
+        return chr(self.data[self.tile_offset + col * self.rows + row])
+
+    def entities(self, first_col=0, last_col=None):
+        """Yield (column, row, kind, parameter) for entities in columns [first_col, last_col)."""
+        lo, hi = self._entity_slot(first_col), self.entity_count
+        if last_col is not None:
+            hi = self._entity_slot(last_col)
+        offset = self.entity_offset
+        table = self.data[offset + lo * ENTITY.size:offset + hi * ENTITY.size]
+        for col, row, kind, param in ENTITY.iter_unpack(table):
+            yield col, row, kind.decode('ascii'), param
+
+    def solid_rects(self):
+        """Yield (column, row, width, height, tile) for the merged solid rectangles."""
+        table = self.data[self.rect_offset:self.rect_offset + self.rect_count * RECT.size]
+        for col, row, width, height, tile in RECT.iter_unpack(table):
+            yield col, row, width, height, tile.decode('ascii')
+
+    def _entity_slot(self, col):
+        # First entity at or after col (the table is sorted by column)
+        lo, hi = 0, self.entity_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if struct.unpack_from('<I', self.data, self.entity_offset + mid * ENTITY.size)[0] < col:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+def level_columns(level_data, first_col=0):
+    """Yield (column, blocks, entities) for each column from first_col on.
+
+    blocks are (row, tile) and entities (row, kind, parameter), top to
+    bottom. level_data is a list of ASCII rows or a LevelFile.
+    """
+    if isinstance(level_data, LevelFile):
+        entities = level_data.entities(first_col)
+        pending = next(entities, None)
+        for col in range(first_col, level_data.cols):
+            blocks = [(row, chr(tile)) for row, tile in enumerate(level_data.column(col)) if tile != EMPTY[0]]
+            found = []
+            while pending is not None and pending[0] == col:
+                found.append(pending[1:])
+                pending = next(entities, None)
+            yield col, blocks, found
+        return
+
+    cols = max(len(row) for row in level_data)
+    for col in range(first_col, cols):
+        blocks, found = [], []
+        for y, row in enumerate(level_data):
+            tile = row[col] if col < len(row) else '.'
+            if tile in '#B?':
+                blocks.append((y, tile))
+            elif tile in 'CGPF':
+                param = 0
+                if tile == 'P':
+                    param = int(row[col+1]) if col+1 < len(row) and row[col+1].isdigit() else DEFAULT_PIPE_HEIGHT
+                found.append((y, tile, param))
+        yield col, blocks, found
+
+
+def read_text_level(path):
+    with open(path) as f:
+        return [line.rstrip('\n') for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile an ASCII level into the binary level format.")
+    parser.add_argument('source', help="text level, one row per line ('-' for the built-in World 1-1)")
+    parser.add_argument('output')
+    args = parser.parse_args()
+    if args.source == '-':
+        from smb1_core import level_1_1
+        level_data = level_1_1
+    else:
+        level_data = read_text_level(args.source)
+    save_level(level_data, args.output)
+    with LevelFile(args.output) as level:
+        print(f"{args.output}: {level.cols}x{level.rows} tiles, {level.rect_count} blocks, {level.entity_count} entities")
+
+
+if __name__ == '__main__':
+    main()
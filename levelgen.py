@@ -0,0 +1,93 @@
+# Seeded procedural levels in the World 1-1 tile vocabulary ('#' ground,
+# 'B' brick, '?' question block, 'C' coin, 'G' Goomba, 'P<n>' pipe of height
+# n, 'F' flag), 14 rows high like level_1_1. The same seed and length always
+# give the same level; gaps stay short enough to jump.
+#
+#   python levelgen.py 10000 --seed 7 > long.txt
+import argparse
+import random
+
+ROWS = 14
+GROUND_ROWS = (12, 13)
+ENTITY_ROW = 11  # standing on the ground
+BLOCK_ROW = 8
+COIN_ROW = 7
+FLAG_ROW = ENTITY_ROW  # the pole stands on the ground
+MIN_COLUMNS = 16
+MAX_GAP = 3  # a running jump clears about 5 tiles
+START_COLUMNS = 6
+END_COLUMNS = 8
+
+
+def generate_level(columns, seed=0):
+    """Return a level of `columns` columns as a list of ROWS strings."""
+    if columns < MIN_COLUMNS:
+        raise ValueError(f"levels need at least {MIN_COLUMNS} columns")
+    rng = random.Random(seed)
+    rows = [bytearray(b'.' * columns) for _ in range(ROWS)]
+    for row in GROUND_ROWS:
+        rows[row][:] = b'#' * columns
+    # The player spawns in column 2, in a dip like World 1-1's
+    rows[GROUND_ROWS[0]][1:4] = b'...'
+
+    col = START_COLUMNS
+    end = columns - END_COLUMNS
+    while col < end:
+        feature = rng.random()
+        if feature < 0.15:
+            width = min(rng.randint(2, MAX_GAP), end - col)
+            for row in GROUND_ROWS:
+                rows[row][col:col + width] = b'.' * width
+            col += width + 2  # always land on ground
+        elif feature < 0.30 and col + 4 <= end:
+            rows[ENTITY_ROW][col:col + 2] = b'P%d' % rng.randint(2, 4)
+            col += 4
+        elif feature < 0.50:
+            width = min(rng.randint(3, 6), end - col)
+            rows[BLOCK_ROW][col:col + width] = bytes(rng.choice(b'BB?') for _ in range(width))
+            if rng.random() < 0.5:
+                rows[BLOCK_ROW - 2][col:col + width] = b'C' * width
+            col += width + 1
+        elif feature < 0.65:
+            width = min(rng.randint(2, 8), end - col)
+            rows[COIN_ROW][col:col + width] = b'C' * width
+            col += width
+        elif feature < 0.80:
+            rows[ENTITY_ROW][col] = ord('G')
+            col += rng.randint(3, 6)
+        else:
+            col += rng.randint(2, 8)
+
+    rows[FLAG_ROW][columns - 4] = ord('F')
+    return [row.decode('ascii') for row in rows]
+
+
+def validate_level(level_data):
+    """Raise ValueError unless level_data is a playable generated-style level."""
+    if len(level_data) != ROWS or len({len(row) for row in level_data}) != 1:
+        raise ValueError(f"levels are {ROWS} rows of equal length")
+    floor = level_data[GROUND_ROWS[-1]]
+    gap = 0
+    for tile in floor:
+        gap = gap + 1 if tile != '#' else 0
+        if gap > MAX_GAP:
+            raise ValueError(f"gap wider than {MAX_GAP} tiles")
+    if not floor.startswith('#' * 4):
+        raise ValueError("level must start on ground")
+    if sum(row.count('F') for row in level_data) != 1:
+        raise ValueError("level needs exactly one flag")
+    if any('F' in level_data[row] for row in GROUND_ROWS):
+        raise ValueError("flag must stand above the ground")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print a seeded procedural level.")
+    parser.add_argument('columns', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for row in generate_level(args.columns, args.seed):
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
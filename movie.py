@@ -0,0 +1,128 @@
+# Input movies: one controller bitmask (see inputs.py) per frame, stored as
+# run-length encoded (count, mask) pairs after a small header.
+#
+#   TEAMFLAMES_RECORD=run.tfm          record this session to run.tfm
+#   TEAMFLAMES_REPLAY=run.tfm          replay run.tfm, then hand back control
+#   TEAMFLAMES_REPLAY_MODE=realtime    1x speed (default)
+#                          uncapped    no frame cap, quit when the movie ends
+#                          skip-render no frame cap or drawing, quit at the end
+import os
+import random
+import struct
+
+MOVIE_MAGIC = b'TFMV'
+MOVIE_VERSION = 1
+MOVIE_HEADER = struct.Struct('<4sBIq')  # magic, version, frame count, world seed (-1: none)
+MOVIE_RUN = struct.Struct('<HB')  # frames, mask
+MAX_RUN = 0xFFFF
+
+REPLAY_MODES = ('realtime', 'uncapped', 'skip-render')
+
+
+class Movie:
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.runs = []  # [count, mask]
+        self.frames = 0
+
+    def append(self, mask):
+        runs = self.runs
+        if runs and runs[-1][1] == mask and runs[-1][0] < MAX_RUN:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, mask])
+        self.frames += 1
+
+    def __len__(self):
+        return self.frames
+
+    def __iter__(self):
+        for count, mask in self.runs:
+            for _ in range(count):
+                yield mask
+
+    def to_bytes(self):
+        seed = -1 if self.seed is None else self.seed
+        parts = [MOVIE_HEADER.pack(MOVIE_MAGIC, MOVIE_VERSION, self.frames, seed)]
+        parts.extend(MOVIE_RUN.pack(count, mask) for count, mask in self.runs)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, frames, seed = MOVIE_HEADER.unpack_from(data)
+        if magic != MOVIE_MAGIC or version != MOVIE_VERSION:
+            raise ValueError("not a TeamFlames input movie")
+        movie = cls(None if seed == -1 else seed)
+        movie.runs = [list(run) for run in MOVIE_RUN.iter_unpack(data[MOVIE_HEADER.size:])]
+        movie.frames = sum(count for count, _ in movie.runs)
+        if movie.frames != frames:
+            raise ValueError("truncated input movie")
+        return movie
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+# Hooks a game loop up to recording and/or replay. Each frame the loop passes
+# its live input through input(); the session substitutes replayed input and
+# records whatever the game actually used.
+class MovieSession:
+    def __init__(self, record_path=None, replay_path=None, mode='realtime'):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"unknown replay mode {mode!r}")
+        self.record_path = record_path
+        self.replay = Movie.load(replay_path) if replay_path else None
+        self.mode = mode if self.replay else 'realtime'
+        self.finished = False
+
+        # World seed: taken from the replay, or picked fresh for a recording
+        if self.replay:
+            self.seed = self.replay.seed
+        elif record_path:
+            self.seed = random.getrandbits(31)
+        else:
+            self.seed = None
+        self.recording = Movie(self.seed) if record_path else None
+        self.frames = iter(self.replay) if self.replay else None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.environ.get('TEAMFLAMES_RECORD') or None,
+            os.environ.get('TEAMFLAMES_REPLAY') or None,
+            os.environ.get('TEAMFLAMES_REPLAY_MODE', 'realtime'),
+        )
+
+    @property
+    def render(self):
+        return self.mode != 'skip-render'
+
+    @property
+    def capped(self):
+        return self.mode == 'realtime'
+
+    @property
+    def quit(self):
+        """True once a fast-forward replay has run out."""
+        return self.finished and self.mode != 'realtime'
+
+    def input(self, live_mask):
+        mask = live_mask
+        if self.frames is not None and not self.finished:
+            mask = next(self.frames, None)
+            if mask is None:
+                self.finished = True
+                mask = live_mask
+        if self.recording is not None:
+            self.recording.append(mask)
+        return mask
+
+    def close(self):
+        if self.recording is not None:
+            self.recording.save(self.record_path)
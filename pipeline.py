@@ -0,0 +1,110 @@
+# Pipelined main loop (TEAMFLAMES_PIPELINE=1): a simulation thread steps the
+# game at a fixed rate and publishes an immutable snapshot of what is on
+# screen after every step; the main thread keeps pumping events (SDL wants
+# that on the thread that opened the window) and draws the newest snapshot.
+#
+# Snapshots are never modified once published, so the buffer only has to swap
+# one reference: the frame being drawn, the snapshot waiting to be drawn and
+# the one being built are three separate objects (triple buffering), and the
+# simulation never waits for the renderer. The gain depends on how much of a
+# frame SDL spends with the GIL released (fills, blits, flip); on a single
+# core there is nothing to overlap and the serial loop is the better choice.
+import queue
+import threading
+import time
+
+# Largest lag, in steps, the simulation thread catches up on before it
+# resets its schedule instead (same idea as TEAMFLAMES_MAX_CATCHUP)
+MAX_LAG_STEPS = 5
+
+
+class SnapshotBuffer:
+    def __init__(self):
+        self.ready = threading.Condition()
+        self.snapshot = None
+        self.serial = 0  # snapshots published so far
+        self.closed = False
+
+    def publish(self, snapshot):
+        with self.ready:
+            self.snapshot = snapshot
+            self.serial += 1
+            self.ready.notify_all()
+
+    def latest(self):
+        return self.snapshot
+
+    def wait(self, serial, timeout=None):
+        """Block until more than serial snapshots are published (or the buffer is
+        closed); returns (snapshot, serial) for the newest one."""
+        with self.ready:
+            self.ready.wait_for(lambda: self.serial > serial or self.closed, timeout)
+            return self.snapshot, self.serial
+
+    def close(self):
+        with self.ready:
+            self.closed = True
+            self.ready.notify_all()
+
+
+# Runs simulate(*controls) rate times a second (as fast as possible for rate=0)
+# on a daemon thread and publishes snapshot() after each step. simulate returns
+# False to stop. The main thread sets .controls each frame and posts anything
+# else that touches game state (savestates and the like) with post().
+class Pipeline:
+    def __init__(self, simulate, snapshot, rate=60, controls=()):
+        self.simulate = simulate
+        self.snapshot = snapshot
+        self.rate = rate
+        self.controls = controls
+        self.buffer = SnapshotBuffer()
+        self.posted = queue.SimpleQueue()
+        self.steps = 0
+        self.done = False
+        self.error = None
+        self.stopping = False
+        self.thread = threading.Thread(target=self.run, name='simulation', daemon=True)
+
+    def start(self):
+        self.buffer.publish(self.snapshot())
+        self.thread.start()
+        return self
+
+    def post(self, fn):
+        """Run fn() on the simulation thread before its next step."""
+        self.posted.put(fn)
+
+    def run(self):
+        dt = 1.0 / self.rate if self.rate else 0.0
+        next_step = time.perf_counter()
+        try:
+            while not self.stopping:
+                while not self.posted.empty():
+                    self.posted.get()()
+                running = self.simulate(*self.controls)
+                self.steps += 1
+                self.buffer.publish(self.snapshot())
+                if not running:
+                    break
+                if not dt:
+                    time.sleep(0)  # let the render thread have the GIL
+                    continue
+                next_step += dt
+                delay = next_step - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -dt * MAX_LAG_STEPS:
+                    next_step = time.perf_counter()
+        except BaseException as error:
+            self.error = error
+        finally:
+            self.done = True
+            self.buffer.close()
+
+    def stop(self):
+        """Stop and join the simulation thread, re-raising anything it raised."""
+        self.stopping = True
+        if self.thread.is_alive():
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
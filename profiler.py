@@ -0,0 +1,171 @@
+# In-game frame profiler on top of the frametime.py phase markers. For every
+# phase it keeps a rolling window of frame times with a matching log2
+# histogram, can draw a small overlay under the score HUD, and writes
+# periodic CSV or JSON reports. When it is off the game loops only pay for
+# the phase markers' global check.
+#
+#   TEAMFLAMES_PROFILE=1              time every frame and show the overlay (F3 toggles it)
+#   TEAMFLAMES_PROFILE_OUT=prof.csv   also write reports, .csv (appended) or .json (latest) ...
+#   TEAMFLAMES_PROFILE_INTERVAL=5     ... every 5 seconds (default)
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+import frametime
+from hud import load_font, TextCache
+
+# Overlay rows in display order, with short labels
+PHASE_LABELS = (
+    ('frame', 'frm'),
+    ('events', 'evt'),
+    ('update', 'inp'),
+    ('player', 'ply'),
+    ('entities', 'ent'),
+    ('draw', 'drw'),
+    ('present', 'flp'),
+)
+# Bucket b counts times of b bits in nanoseconds, i.e. in [2**(b-1), 2**b)
+HISTOGRAM_BUCKETS = 32
+CSV_FIELDS = ('time', 'phase', 'count', 'mean_us', 'p50_us', 'p99_us', 'max_us')
+
+
+def bucket(ns):
+    return min(ns.bit_length(), HISTOGRAM_BUCKETS - 1)
+
+
+# Rolling window of one phase's per-frame times, plus lifetime totals
+class PhaseStats:
+    def __init__(self, window):
+        self.recent = deque(maxlen=window)
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0
+
+    def add(self, ns):
+        recent = self.recent
+        if len(recent) == recent.maxlen:
+            self.histogram[bucket(recent[0])] -= 1
+        recent.append(ns)
+        self.histogram[bucket(ns)] += 1
+        self.count += 1
+        self.total += ns
+
+    def summary(self):
+        ordered = sorted(self.recent)
+        if not ordered:
+            return None
+
+        def pick(pct):
+            return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] / 1000
+
+        return {
+            'count': self.count,
+            'mean_us': sum(ordered) / len(ordered) / 1000,
+            'p50_us': pick(50),
+            'p99_us': pick(99),
+            'max_us': ordered[-1] / 1000,
+        }
+
+
+class Profiler(frametime.PhaseRecorder):
+    def __init__(self, window=240, out_path=None, interval=5.0, overlay=True, pos=(10, 34)):
+        super().__init__()
+        self.window = window
+        self.stats = {'frame': PhaseStats(window)}
+        self.out_path = out_path
+        self.interval = interval
+        self.next_dump = time.monotonic() + interval
+        self.wrote_csv = False
+        self.overlay = overlay
+        self.pos = pos
+        self.text = None
+        self.lines = []
+        self.frames_since_text = 0
+
+    @classmethod
+    def from_env(cls):
+        """Install and return a Profiler if TEAMFLAMES_PROFILE=1, else None."""
+        if os.environ.get('TEAMFLAMES_PROFILE') != '1':
+            return None
+        profiler = cls(
+            out_path=os.environ.get('TEAMFLAMES_PROFILE_OUT') or None,
+            interval=float(os.environ.get('TEAMFLAMES_PROFILE_INTERVAL', 5)),
+        )
+        frametime.install(profiler)
+        return profiler
+
+    def end_frame(self, frame):
+        stats = self.stats
+        total = 0
+        for name, ns in frame.items():
+            phase_stats = stats.get(name)
+            if phase_stats is None:
+                phase_stats = stats[name] = PhaseStats(self.window)
+            phase_stats.add(ns)
+            total += ns
+        stats['frame'].add(total)
+        if self.out_path and time.monotonic() >= self.next_dump:
+            self.dump()
+            self.next_dump = time.monotonic() + self.interval
+
+    def report(self):
+        phases = {}
+        for name, phase_stats in self.stats.items():
+            summary = phase_stats.summary()
+            if summary:
+                summary['histogram'] = list(phase_stats.histogram)
+                phases[name] = summary
+        return {'time': time.time(), 'window': self.window, 'phases': phases}
+
+    def dump(self, path=None):
+        """Write a report: CSV rows are appended, a JSON file holds the latest report."""
+        path = path or self.out_path
+        report = self.report()
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+            return
+        with open(path, 'a' if self.wrote_csv else 'w', newline='') as f:
+            writer = csv.DictWriter(f, CSV_FIELDS, extrasaction='ignore')
+            if not self.wrote_csv:
+                writer.writeheader()
+            for name, summary in report['phases'].items():
+                writer.writerow(dict(summary, time=f"{report['time']:.3f}", phase=name))
+        self.wrote_csv = True
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.overlay = not self.overlay
+
+    def draw(self, screen):
+        """Draw the overlay (if shown); returns the rects drawn."""
+        if not self.overlay:
+            return []
+        if self.text is None:
+            self.text = TextCache(load_font(None, 16))
+        # Re-render the numbers a few times a second, not every frame
+        self.frames_since_text += 1
+        if not self.lines or self.frames_since_text >= 15:
+            self.frames_since_text = 0
+            self.lines = []
+            for name, label in PHASE_LABELS:
+                phase_stats = self.stats.get(name)
+                summary = phase_stats.summary() if phase_stats else None
+                if summary:
+                    self.lines.append(f"{label} {summary['mean_us'] / 1000:5.2f} {summary['p99_us'] / 1000:5.2f}ms")
+        x, y = self.pos
+        rects = []
+        for line in self.lines:
+            surface = self.text.render(line)
+            rects.append(screen.blit(surface, (x, y)))
+            y += surface.get_height()
+        return rects
+
+    def close(self):
+        if self.out_path:
+            self.dump()
+        frametime.install(None)
@@ -0,0 +1,181 @@
+# Headless game core for the ZeroCoin SMB1 clones (TeamFlamesSMB1Recomp.py and
+# TeamFlamesSMB1PCPort.py). Runs without a window; the scripts only draw.
+import random
+import pygame
+from spatial_hash import SpatialHash
+from tilegrid import merge_tiles
+from culling import XIndex
+from frametime import phase
+from collectibles import Collectibles
+from inputs import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from savestate import STATE_VERSION, WORLD_STATE, pack_player, unpack_player, pack_alive, unpack_alive
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 256, 240
+
+# Colors
+COLOR_BG = (92, 148, 252)
+COLOR_BRICK = (200, 76, 12)
+COLOR_COIN = (255, 223, 0)
+COLOR_PLAYER = (255, 0, 0)
+COLOR_GROUND = (106, 190, 48)
+COLOR_FLAG = (255, 255, 255)
+
+# Player Class
+class Player:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 16, 16)
+        self.vx, self.vy = 0, 0
+        self.speed = 2
+        self.jump_power = -8
+        self.gravity = 0.4
+        self.on_ground = False
+        self.score = 0
+        self.deaths = 0
+
+    def update(self, solids, inputs):
+        self.vx = 0
+        if inputs & INPUT_LEFT:
+            self.vx = -self.speed
+        if inputs & INPUT_RIGHT:
+            self.vx = self.speed
+        if inputs & INPUT_JUMP and self.on_ground:  # Jump (Z)
+            self.vy = self.jump_power
+            self.on_ground = False
+
+        self.vy += self.gravity
+        self.rect.x += self.vx
+        self.collide(self.vx, 0, solids)
+        self.rect.y += self.vy
+        self.on_ground = False
+        self.collide(0, self.vy, solids)
+
+        if self.rect.y > SCREEN_HEIGHT:
+            self.respawn()
+
+    def respawn(self):
+        self.deaths += 1
+        self.rect.x, self.rect.y = 32, 180
+        self.vx, self.vy = 0, 0
+
+    def collide(self, dx, dy, solids):
+        for p in solids.query(self.rect):
+            if self.rect.colliderect(p.rect):
+                if dx > 0:
+                    self.rect.right = p.rect.left
+                if dx < 0:
+                    self.rect.left = p.rect.right
+                if dy > 0:
+                    self.rect.bottom = p.rect.top
+                    self.vy = 0
+                    self.on_ground = True
+                if dy < 0:
+                    self.rect.top = p.rect.bottom
+                    self.vy = 0
+
+# Platform Class
+class Platform:
+    def __init__(self, x, y, w=16, h=16, color=COLOR_BRICK):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.color = color
+
+# Coin Class
+class Coin:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 8, 8)
+
+# Flag Class
+class Flag:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 8, 32)
+
+# All mutable game state for one run of the level
+class World:
+    def __init__(self, seed=None):
+        # Coins are scattered at random; a seed makes the layout reproducible
+        rng = random.Random(seed) if seed is not None else random
+
+        # World Generation (Synthetic from imagination)
+        self.platforms = []
+        self.coins = []
+
+        # Ground, merged into as few boxes as possible
+        ground_tiles = {(x // 16, (SCREEN_HEIGHT - 16) // 16): COLOR_GROUND for x in range(0, 3000, 16)}
+        for x, y, w, h, color in merge_tiles(ground_tiles):
+            self.platforms.append(Platform(x * 16, y * 16, w * 16, h * 16, color))
+
+        # Bricks
+        for i in range(5):
+            self.platforms.append(Platform(100 + i*18, 150, 16, 16))
+
+        for i in range(3):
+            self.platforms.append(Platform(250 + i*18, 120, 16, 16))
+
+        # Random Coins
+        for i in range(10):
+            self.coins.append(Coin(rng.randint(100, 800), rng.randint(80, 180)))
+
+        # Flag
+        self.flag = Flag(900, SCREEN_HEIGHT - 48)
+
+        # Broadphase for solid platforms
+        self.solids = SpatialHash()
+        for p in self.platforms:
+            self.solids.insert(p)
+
+        # Draw-order index, sorted by x for viewport culling
+        self.platform_index = XIndex(self.platforms)
+
+        self.player = Player(32, 180)
+        self.scroll_x = 0  # Camera offset
+        self.frame = 0
+        self.complete = False
+
+        # Everything the level started with, for savestates
+        self.all_coins = tuple(self.coins)
+
+        # Coins are looked up by grid cell, both for collection and drawing
+        self.coins = Collectibles(self.coins)
+
+    def save_state(self):
+        """Pack all mutable state into bytes."""
+        return b''.join([
+            WORLD_STATE.pack(STATE_VERSION, self.frame, self.complete, self.scroll_x),
+            pack_player(self.player),
+            pack_alive(self.all_coins, self.coins),
+        ])
+
+    def load_state(self, data):
+        """Restore state produced by save_state() on a World with the same seed."""
+        version, self.frame, self.complete, self.scroll_x = WORLD_STATE.unpack_from(data)
+        if version != STATE_VERSION:
+            raise ValueError(f"unsupported savestate version {version}")
+        offset = unpack_player(self.player, data, WORLD_STATE.size)
+        coins, offset = unpack_alive(self.all_coins, data, offset)
+        if offset != len(data):
+            raise ValueError("savestate does not match this level")
+        self.coins = Collectibles(coins)
+
+def step(world, inputs):
+    """Advance the world by one frame; returns False once the flag is reached."""
+    player = world.player
+    phase('player')
+    player.update(world.solids, inputs)
+
+    phase('entities')
+    for coin in world.coins.collect(player.rect):
+        player.score += 100
+    if player.rect.colliderect(world.flag.rect):
+        world.complete = True
+
+    # Scroll Camera
+    world.scroll_x = player.rect.x - 64
+
+    world.frame += 1
+    return not world.complete
+
+def run(world, input_sequence):
+    """Step through a sequence of input bitmasks until it ends or the flag is reached."""
+    for inputs in input_sequence:
+        if not step(world, inputs):
+            break
+    return world
@@ -0,0 +1,97 @@
+# Rewind buffer for packed savestates (World.save_state()). States are kept
+# in groups: a full keyframe followed by XOR deltas against that keyframe,
+# stored as runs of changed bytes. Whole groups drop off the old end of the
+# ring, so both the frame count and the byte budget stay bounded.
+import struct
+from collections import deque
+
+# Delta run header: offset, length (32-bit offsets, states can exceed 64 KiB)
+DELTA_RUN = struct.Struct('<IB')
+
+
+def xor_delta(base, state):
+    """Encode state as the runs of bytes where it differs from base."""
+    size = len(state)
+    diff = (int.from_bytes(base, 'little') ^ int.from_bytes(state, 'little')).to_bytes(size, 'little')
+    out = bytearray()
+    i = 0
+    while i < size:
+        if not diff[i]:
+            i += 1
+            continue
+        j = i + 1
+        # Bridge short zero gaps; a new run header would cost more
+        while j < size and j - i < 255 and (diff[j] or any(diff[j:j + DELTA_RUN.size])):
+            j += 1
+        out += DELTA_RUN.pack(i, j - i)
+        out += diff[i:j]
+        i = j
+    return bytes(out)
+
+
+def apply_delta(base, delta):
+    diff = bytearray(len(base))
+    offset = 0
+    while offset < len(delta):
+        start, length = DELTA_RUN.unpack_from(delta, offset)
+        offset += DELTA_RUN.size
+        diff[start:start + length] = delta[offset:offset + length]
+        offset += length
+    return (int.from_bytes(base, 'little') ^ int.from_bytes(diff, 'little')).to_bytes(len(base), 'little')
+
+
+class RewindBuffer:
+    def __init__(self, seconds=10, fps=60, keyframe_interval=60, max_bytes=1 << 20):
+        self.max_frames = max(1, int(seconds * fps))
+        self.keyframe_interval = keyframe_interval
+        # The newest group is never dropped, so it alone must fit the limits
+        self.group_frames = min(keyframe_interval, self.max_frames)
+        self.max_bytes = max_bytes
+        self.groups = deque()  # [keyframe, [delta, ...], bytes]
+        self.frames = 0
+        self.bytes = 0
+
+    def __len__(self):
+        return self.frames
+
+    def push(self, state):
+        group = self.groups[-1] if self.groups else None
+        delta = None
+        if group is not None and len(group[1]) + 1 < self.group_frames and len(group[0]) == len(state):
+            delta = xor_delta(group[0], state)
+            if group[2] + len(delta) > self.max_bytes:
+                delta = None  # Start a new keyframe rather than outgrow the budget
+        if delta is None:
+            self.groups.append([state, [], len(state)])
+            self.bytes += len(state)
+        else:
+            group[1].append(delta)
+            group[2] += len(delta)
+            self.bytes += len(delta)
+        self.frames += 1
+
+        # Drop the oldest groups, but never the one being written
+        while len(self.groups) > 1 and (self.frames > self.max_frames or self.bytes > self.max_bytes):
+            _, deltas, size = self.groups.popleft()
+            self.frames -= 1 + len(deltas)
+            self.bytes -= size
+
+    def pop(self):
+        """Remove and return the newest state, or None when empty."""
+        if not self.groups:
+            return None
+        group = self.groups[-1]
+        keyframe, deltas = group[0], group[1]
+        self.frames -= 1
+        if deltas:
+            delta = deltas.pop()
+            group[2] -= len(delta)
+            self.bytes -= len(delta)
+            return apply_delta(keyframe, delta)
+        self.groups.pop()
+        self.bytes -= len(keyframe)
+        return keyframe
+
+    def clear(self):
+        self.groups.clear()
+        self.frames = self.bytes = 0
@@ -0,0 +1,38 @@
+# Packed savestate helpers shared by the game cores. A savestate only holds
+# what can change while playing; static terrain is rebuilt from level data.
+import struct
+
+STATE_VERSION = 1
+
+# version, frame, complete, scroll_x
+WORLD_STATE = struct.Struct('<BI?i')
+# x, y, vx, vy, on_ground, score, deaths
+PLAYER_STATE = struct.Struct('<iiid?iI')
+
+
+def pack_player(player):
+    rect = player.rect
+    return PLAYER_STATE.pack(rect.x, rect.y, player.vx, player.vy, player.on_ground, player.score, player.deaths)
+
+
+def unpack_player(player, data, offset):
+    x, y, player.vx, player.vy, player.on_ground, player.score, player.deaths = PLAYER_STATE.unpack_from(data, offset)
+    player.rect.x, player.rect.y = x, y
+    return offset + PLAYER_STATE.size
+
+
+def pack_alive(all_items, items):
+    """Bitmap of which of all_items are still present in items."""
+    present = set(items)
+    bits = 0
+    for i, item in enumerate(all_items):
+        if item in present:
+            bits |= 1 << i
+    return bits.to_bytes((len(all_items) + 7) // 8, 'little')
+
+
+def unpack_alive(all_items, data, offset):
+    """Return (surviving items in original order, new offset)."""
+    size = (len(all_items) + 7) // 8
+    bits = int.from_bytes(data[offset:offset + size], 'little')
+    return [item for i, item in enumerate(all_items) if bits >> i & 1], offset + size
@@ -0,0 +1,160 @@
+# Struct-of-arrays engine that steps many World 1-1 games at once. Every field
+# of Player/Goomba is a NumPy array with the batch as its first axis, and one
+# step() advances all worlds with vectorized operations. It follows the same
+# rules as smb1_core.step(), including pygame.Rect's rounding of float moves.
+import numpy as np
+
+from inputs import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from smb1_core import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, level_1_1, generate_world
+
+PLAYER_SPEED = 2
+JUMP_POWER = -8
+GRAVITY = 0.4
+STOMP_BOUNCE = -5
+SPAWN_X, SPAWN_Y = TILE_SIZE * 2, SCREEN_HEIGHT - TILE_SIZE * 3
+
+
+def round_rect(values):
+    # pygame.Rect rounds float coordinates half away from zero
+    return (np.sign(values) * np.floor(np.abs(values) + 0.5)).astype(np.int32)
+
+
+def overlaps(ax, ay, aw, ah, bx, by, bw, bh):
+    return (ax < bx + bw) & (bx < ax + aw) & (ay < by + bh) & (by < ay + ah)
+
+
+class BatchWorld:
+    def __init__(self, count, level_data=level_1_1):
+        _, coins, enemies, _, flag, grid = generate_world(level_data)
+        self.count = count
+
+        # Shared level: solid tiles with one empty cell of padding on each side
+        solid = np.zeros((grid.rows + 2, grid.cols + 2), dtype=bool)
+        for col, row, _ in grid.items():
+            solid[row + 1, col + 1] = True
+        self.solid = solid
+
+        # Shared static rects (x, y, w, h columns)
+        self.coin_rects = np.array([tuple(c.rect) for c in coins], dtype=np.int32).reshape(-1, 4)
+        self.flag_rect = tuple(flag.pole) if flag else None
+        goomba_start = np.array([x for x, _ in enemies], dtype=np.int32)
+        self.goomba_y = np.array([y for _, y in enemies], dtype=np.int32)
+
+        # Per-world state
+        self.x = np.full(count, SPAWN_X, dtype=np.int32)
+        self.y = np.full(count, SPAWN_Y, dtype=np.int32)
+        self.vx = np.zeros(count, dtype=np.int32)
+        self.vy = np.zeros(count, dtype=np.float64)
+        self.on_ground = np.zeros(count, dtype=bool)
+        self.score = np.zeros(count, dtype=np.int32)
+        self.deaths = np.zeros(count, dtype=np.int32)
+        self.scroll_x = np.zeros(count, dtype=np.int32)
+        self.frame = np.zeros(count, dtype=np.int32)
+        self.complete = np.zeros(count, dtype=bool)
+        self.coin_alive = np.ones((count, len(coins)), dtype=bool)
+        self.goomba_x = np.tile(goomba_start, (count, 1))
+        self.goomba_vx = np.full((count, len(enemies)), -1, dtype=np.int32)
+        self.goomba_alive = np.ones((count, len(enemies)), dtype=bool)
+
+    STATE_FIELDS = (
+        'x', 'y', 'vx', 'vy', 'on_ground', 'score', 'deaths', 'scroll_x', 'frame',
+        'coin_alive', 'goomba_x', 'goomba_vx', 'goomba_alive',
+    )
+
+    def is_solid(self, col, row):
+        rows, cols = self.solid.shape
+        return self.solid[np.clip(row + 1, 0, rows - 1), np.clip(col + 1, 0, cols - 1)]
+
+    def step(self, inputs):
+        """Advance every unfinished world by one frame; inputs is one bitmask per world."""
+        inputs = np.broadcast_to(np.asarray(inputs, dtype=np.int32), (self.count,))
+        done = self.complete.copy()
+        if done.any():
+            saved = {name: getattr(self, name).copy() for name in self.STATE_FIELDS}
+
+        self.update_players(inputs)
+        self.update_goombas()
+        self.collect_coins()
+        self.hit_goombas()
+
+        # Win Condition
+        if self.flag_rect is not None:
+            self.complete |= overlaps(self.x, self.y, TILE_SIZE, TILE_SIZE, *self.flag_rect)
+
+        # Scroll Camera (only rightward, SMB1 style)
+        self.scroll_x = np.maximum(self.scroll_x, self.x - SCREEN_WIDTH // 2)
+        self.frame += 1
+
+        if done.any():
+            for name, values in saved.items():
+                getattr(self, name)[done] = values[done]
+        return ~self.complete
+
+    def update_players(self, inputs):
+        self.vx = np.where(inputs & INPUT_RIGHT, PLAYER_SPEED,
+                           np.where(inputs & INPUT_LEFT, -PLAYER_SPEED, 0)).astype(np.int32)
+        jump = ((inputs & INPUT_JUMP) != 0) & self.on_ground
+        self.vy = np.where(jump, float(JUMP_POWER), self.vy)
+        self.on_ground &= ~jump
+        self.vy += GRAVITY
+
+        # Horizontal move, then push out of the column the leading edge entered
+        self.x += self.vx
+        top_row = self.y // TILE_SIZE
+        bottom_row = (self.y + TILE_SIZE - 1) // TILE_SIZE
+        right_col = (self.x + TILE_SIZE - 1) // TILE_SIZE
+        left_col = self.x // TILE_SIZE
+        hit_right = (self.vx > 0) & (self.is_solid(right_col, top_row) | self.is_solid(right_col, bottom_row))
+        hit_left = (self.vx < 0) & (self.is_solid(left_col, top_row) | self.is_solid(left_col, bottom_row))
+        self.x = np.where(hit_right, right_col * TILE_SIZE - TILE_SIZE, self.x)
+        self.x = np.where(hit_left, (left_col + 1) * TILE_SIZE, self.x)
+
+        # Vertical move, then push out of the row the leading edge entered
+        self.y = round_rect(self.y + self.vy)
+        self.on_ground[:] = False
+        left_col = self.x // TILE_SIZE
+        right_col = (self.x + TILE_SIZE - 1) // TILE_SIZE
+        bottom_row = (self.y + TILE_SIZE - 1) // TILE_SIZE
+        top_row = self.y // TILE_SIZE
+        falling = self.vy > 0
+        rising = self.vy < 0
+        land = falling & (self.is_solid(left_col, bottom_row) | self.is_solid(right_col, bottom_row))
+        bump = rising & (self.is_solid(left_col, top_row) | self.is_solid(right_col, top_row))
+        self.y = np.where(land, bottom_row * TILE_SIZE - TILE_SIZE, self.y)
+        self.y = np.where(bump, (top_row + 1) * TILE_SIZE, self.y)
+        self.vy = np.where(land | bump, 0.0, self.vy)
+        self.on_ground |= land
+
+        self.respawn(self.y > SCREEN_HEIGHT)
+
+    def respawn(self, mask):
+        self.deaths += mask
+        self.x[mask] = SPAWN_X
+        self.y[mask] = SPAWN_Y
+        self.vx[mask] = 0
+        self.vy[mask] = 0.0
+
+    def update_goombas(self):
+        self.goomba_x += self.goomba_vx
+        turn = (self.goomba_x < 0) | (self.goomba_x > 3000)  # Reverse direction at bounds
+        self.goomba_vx = np.where(turn, -self.goomba_vx, self.goomba_vx)
+
+    def collect_coins(self):
+        if not len(self.coin_rects):
+            return
+        cx, cy, cw, ch = self.coin_rects.T
+        hit = self.coin_alive & overlaps(self.x[:, None], self.y[:, None], TILE_SIZE, TILE_SIZE, cx, cy, cw, ch)
+        self.score += 100 * hit.sum(axis=1, dtype=np.int32)
+        self.coin_alive &= ~hit
+
+    def hit_goombas(self):
+        # Goombas are checked one at a time, as a stomp or respawn changes the
+        # player for the next one; each check covers the whole batch
+        for i in range(self.goomba_x.shape[1]):
+            gx, gy = self.goomba_x[:, i], self.goomba_y[i]
+            hit = self.goomba_alive[:, i] & overlaps(self.x, self.y, TILE_SIZE, TILE_SIZE, gx, gy, TILE_SIZE, TILE_SIZE)
+            stomp = hit & (self.vy > 0) & (self.y + TILE_SIZE > gy)
+            self.goomba_alive[:, i] &= ~stomp
+            self.score += 200 * stomp
+            self.vy = np.where(stomp, float(STOMP_BOUNCE), self.vy)
+            self.respawn(hit & ~stomp)
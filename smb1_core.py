@@ -0,0 +1,304 @@
+# Headless game core for the Super Mario Bros. 1 clone ($TEAMFLAMESHDRSMB1-1.py).
+# Everything here runs without a window: the game script draws a World, and
+# tools can drive step() directly with input bitmasks at any speed.
+import numpy as np
+import pygame
+from ecs import EntityStore, patrol, overlapping
+from tilegrid import TileGrid, merge_tiles
+from culling import XIndex
+from frametime import phase
+from collectibles import Collectibles
+from level_format import LevelFile, parse_entities
+from inputs import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from savestate import STATE_VERSION, WORLD_STATE, pack_player, unpack_player, pack_alive, unpack_alive
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 256, 240  # NES resolution
+
+# Colors (approximating SMB1 palette)
+COLOR_BG = (92, 148, 252)       # Sky blue
+COLOR_GROUND = (139, 69, 19)    # Brown dirt
+COLOR_BRICK = (200, 76, 12)     # Brick orange
+COLOR_QBLOCK = (255, 215, 0)    # Question block yellow
+COLOR_COIN = (255, 223, 0)      # Coin gold
+COLOR_PLAYER = (255, 0, 0)      # Mario red
+COLOR_GOOMBA = (139, 69, 19)    # Goomba brown
+COLOR_PIPE = (0, 128, 0)        # Pipe green
+COLOR_FLAGPOLE = (169, 169, 169) # Flagpole gray
+COLOR_FLAG = (255, 255, 255)    # Flag white
+
+# Tile Size
+TILE_SIZE = 16
+
+# Player Class
+class Player:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+        self.vx, self.vy = 0, 0
+        self.speed = 2
+        self.jump_power = -8
+        self.gravity = 0.4
+        self.on_ground = False
+        self.score = 0
+        self.deaths = 0
+
+    def update(self, grid, inputs):
+        self.vx = 0
+        if inputs & INPUT_LEFT:
+            self.vx = -self.speed
+        if inputs & INPUT_RIGHT:
+            self.vx = self.speed
+        if inputs & INPUT_JUMP and self.on_ground:  # Jump (Space)
+            self.vy = self.jump_power
+            self.on_ground = False
+
+        self.vy += self.gravity
+        self.rect.x += self.vx
+        self.collide(self.vx, 0, grid)
+        self.rect.y += self.vy
+        self.on_ground = False
+        self.collide(0, self.vy, grid)
+
+        if self.rect.y > SCREEN_HEIGHT:
+            self.respawn()
+
+    def respawn(self):
+        self.deaths += 1
+        self.rect.x, self.rect.y = TILE_SIZE * 2, SCREEN_HEIGHT - TILE_SIZE * 3
+        self.vx, self.vy = 0, 0
+
+    def collide(self, dx, dy, grid):
+        # Only the tiles under the player's rect can collide
+        for p in grid.query(self.rect):
+            if self.rect.colliderect(p.rect):
+                if dx > 0:
+                    self.rect.right = p.rect.left
+                if dx < 0:
+                    self.rect.left = p.rect.right
+                if dy > 0:
+                    self.rect.bottom = p.rect.top
+                    self.vy = 0
+                    self.on_ground = True
+                if dy < 0:
+                    self.rect.top = p.rect.bottom
+                    self.vy = 0
+
+# Platform Class
+class Platform:
+    def __init__(self, x, y, w=TILE_SIZE, h=TILE_SIZE, color=COLOR_BRICK):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.color = color
+
+# Coin Class
+class Coin:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x + 4, y + 4, 8, 8)  # Smaller for coin
+
+# Goombas live in an EntityStore archetype (see ecs.py): one row of pos, vel
+# and size per Goomba, moved by patrol() in one pass per frame
+GOOMBA_COMPONENTS = ('pos', 'vel', 'size')
+GOOMBA_SPEED = -1  # Moves left
+GOOMBA_RANGE = (0, 3000)  # Reverse direction at bounds
+
+def spawn_goombas(store, positions, vx=GOOMBA_SPEED):
+    """Add Goombas at (x, y) positions to store; returns their entity ids."""
+    store.archetype('goomba', GOOMBA_COMPONENTS)
+    pos = np.array(positions, dtype=np.int32).reshape(-1, 2)
+    vel = np.zeros_like(pos)
+    vel[:, 0] = vx
+    return store.spawn_many('goomba', len(pos), pos=pos, vel=vel, size=TILE_SIZE)
+
+# Pipe Class
+class Pipe:
+    def __init__(self, x, y, height):
+        self.rect = pygame.Rect(x, y - (height - 1) * TILE_SIZE, TILE_SIZE * 2, height * TILE_SIZE)
+    def draw(self, screen, scroll_x):
+        pygame.draw.rect(screen, COLOR_PIPE, (self.rect.x - scroll_x, self.rect.y, self.rect.width, self.rect.height))
+
+# Flag Class
+class Flag:
+    def __init__(self, x, y):
+        self.pole = pygame.Rect(x, y - TILE_SIZE * 8, 4, TILE_SIZE * 8)  # Flagpole
+        self.flag = pygame.Rect(x - 8, y - TILE_SIZE * 8, TILE_SIZE, TILE_SIZE)  # Flag
+
+# Level Data for World 1-1 (simplified representation)
+# '#' = ground, 'B' = brick, '?' = question block, 'C' = coin, 'G' = Goomba, 'P' = pipe, 'F' = flag
+level_1_1 = [
+    "........................................................................................",
+    "........................................................................................",
+    "........................................................................................",
+    "........................................................................................",
+    "....?B?B?..C....C......................................................................",
+    "....B...B...............................................................................",
+    "........................................................................................",
+    ".............G..........................................................................",
+    ".....................P2...........................P3............................F..........",
+    "........................................................................................",
+    "........................................................................................",
+    "........................................................................................",
+    "#..#####################....###############.....#################.....###################",
+    "########################################################################################",
+]
+
+# Solid tile colors
+BLOCK_COLORS = {'#': COLOR_GROUND, 'B': COLOR_BRICK, '?': COLOR_QBLOCK}
+
+def generate_world(level_data):
+    """Build a level from ASCII rows or a compiled LevelFile (see level_format.py).
+
+    enemies are the (x, y) spawn positions of the Goombas.
+    """
+    platforms = []
+    coins = []
+    enemies = []
+    pipes = []
+    flag = None
+    if isinstance(level_data, LevelFile):
+        cols, rows = level_data.cols, level_data.rows
+        # Same (row-major) entity order as the text path
+        entities = sorted(level_data.entities(), key=lambda e: (e[1], e[0]))
+        # Blocks come already merged
+        blocks = ((x, y, w, h, BLOCK_COLORS[tile]) for x, y, w, h, tile in level_data.solid_rects())
+    else:
+        cols, rows = max(len(row) for row in level_data), len(level_data)
+        entities = parse_entities(level_data)
+        # Merge runs of same-colored blocks into larger boxes for collision and drawing
+        blocks = merge_tiles({(x, y): BLOCK_COLORS[tile] for y, row in enumerate(level_data)
+                              for x, tile in enumerate(row) if tile in BLOCK_COLORS})
+
+    # Each cell of grid holds the merged block covering it
+    grid = TileGrid(cols, rows, TILE_SIZE)
+    for x, y, w, h, color in blocks:
+        platform = Platform(x * TILE_SIZE, y * TILE_SIZE, w * TILE_SIZE, h * TILE_SIZE, color)
+        platforms.append(platform)
+        grid.fill(x, y, w, h, platform)
+
+    for x, y, kind, param in entities:
+        pos_x = x * TILE_SIZE
+        pos_y = y * TILE_SIZE
+        if kind == 'C':
+            coins.append(Coin(pos_x, pos_y))
+        elif kind == 'G':
+            enemies.append((pos_x, pos_y))
+        elif kind == 'P':
+            pipes.append(Pipe(pos_x, pos_y, param))
+        elif kind == 'F':
+            flag = Flag(pos_x, pos_y)
+
+    return platforms, coins, enemies, pipes, flag, grid
+
+# Goomba savestate entry: x, vx (same layout as struct '<ib')
+GOOMBA_STATE = np.dtype([('x', '<i4'), ('vx', 'i1')])
+
+# All mutable game state for one run of a level
+class World:
+    def __init__(self, level_data=level_1_1):
+        (self.platforms, self.coins, goombas, self.pipes,
+         self.flag, self.grid) = generate_world(level_data)
+
+        # Draw-order indexes, sorted by x for viewport culling
+        self.platform_index = XIndex(self.platforms)
+        self.pipe_index = XIndex(self.pipes)
+
+        self.player = Player(TILE_SIZE * 2, SCREEN_HEIGHT - TILE_SIZE * 3)
+        self.scroll_x = 0  # Camera offset
+        self.frame = 0
+        self.complete = False
+
+        # Everything the level started with, for savestates; Goomba ids are
+        # their index in goomba_spawns
+        self.all_coins = tuple(self.coins)
+        self.goomba_spawns = np.array(goombas, dtype=np.int32).reshape(-1, 2)
+        self.store = EntityStore()
+        spawn_goombas(self.store, self.goomba_spawns)
+        self.goombas = self.store['goomba']
+
+        # Coins are looked up by grid cell, both for collection and drawing
+        self.coins = Collectibles(self.coins)
+
+    def save_state(self):
+        """Pack all mutable state into bytes."""
+        goombas, count = self.goombas, len(self.goomba_spawns)
+        ids = goombas.ids[:len(goombas)]
+        states = np.zeros(count, dtype=GOOMBA_STATE)
+        states['x'][ids] = goombas['pos'][:, 0]
+        states['vx'][ids] = goombas['vel'][:, 0]
+        return b''.join([
+            WORLD_STATE.pack(STATE_VERSION, self.frame, self.complete, self.scroll_x),
+            pack_player(self.player),
+            pack_alive(self.all_coins, self.coins),
+            pack_alive(range(count), ids.tolist()),
+            states.tobytes(),
+        ])
+
+    def load_state(self, data):
+        """Restore state produced by save_state() on a World of the same level."""
+        version, self.frame, self.complete, self.scroll_x = WORLD_STATE.unpack_from(data)
+        if version != STATE_VERSION:
+            raise ValueError(f"unsupported savestate version {version}")
+        count = len(self.goomba_spawns)
+        offset = unpack_player(self.player, data, WORLD_STATE.size)
+        coins, offset = unpack_alive(self.all_coins, data, offset)
+        alive, offset = unpack_alive(range(count), data, offset)
+        if offset + count * GOOMBA_STATE.itemsize != len(data):
+            raise ValueError("savestate does not match this level")
+        states = np.frombuffer(data, GOOMBA_STATE, count, offset)
+        self.coins = Collectibles(coins)
+
+        # Respawn every Goomba so ids match goomba_spawns again, then drop the dead
+        positions = self.goomba_spawns.copy()
+        positions[:, 0] = states['x']
+        self.store = EntityStore()
+        ids = spawn_goombas(self.store, positions)
+        self.goombas = self.store['goomba']
+        self.goombas['vel'][:, 0] = states['vx']
+        self.store.despawn_many(np.setdiff1d(ids, alive))
+
+def step(world, inputs):
+    """Advance the world by one frame; returns False once the level is complete."""
+    player = world.player
+
+    # Update
+    phase('player')
+    player.update(world.grid, inputs)
+    phase('entities')
+    patrol(world.goombas, *GOOMBA_RANGE)
+
+    # Coin Collection
+    for coin in world.coins.collect(player.rect):
+        player.score += 100
+
+    # Enemy Collision, in spawn order: a stomp or respawn changes the player
+    # for the Goombas after it
+    store = world.store
+    hits = sorted(overlapping(world.goombas, player.rect).tolist())
+    while hits:
+        goomba = hits.pop(0)
+        top = store.get(goomba, 'pos')[1]
+        if player.vy > 0 and player.rect.bottom > top:
+            store.despawn(goomba)
+            player.score += 200
+            player.vy = -5  # Bounce
+        else:
+            player.respawn()
+            hits = sorted(g for g in overlapping(world.goombas, player.rect).tolist() if g > goomba)
+
+    # Win Condition
+    flag = world.flag
+    if flag and player.rect.colliderect(flag.pole):
+        world.complete = True
+
+    # Scroll Camera (only rightward, SMB1 style)
+    if player.rect.x > world.scroll_x + SCREEN_WIDTH // 2:
+        world.scroll_x = player.rect.x - SCREEN_WIDTH // 2
+    if world.scroll_x < 0:
+        world.scroll_x = 0
+
+    world.frame += 1
+    return not world.complete
+
+def run(world, input_sequence):
+    """Step through a sequence of input bitmasks until it ends or the level is complete."""
+    for inputs in input_sequence:
+        if not step(world, inputs):
+            break
+    return world
@@ -0,0 +1,87 @@
+# Draws a smb1_core World (or streaming.StreamingWorld) from the camera's
+# point of view. Shared by $TEAMFLAMESHDRSMB1-1.py and the benchmarks.
+from collections import namedtuple
+
+import pygame
+from chunk_cache import ChunkCache
+from ecs import visible
+from timestep import Interpolator
+from smb1_core import SCREEN_WIDTH, SCREEN_HEIGHT, COLOR_BG, COLOR_COIN, COLOR_PLAYER, COLOR_GOOMBA, COLOR_FLAGPOLE, COLOR_FLAG
+
+# Everything draw_snapshot() needs that changes while playing, as plain tuples
+# ((x, y, w, h) rects) so a simulation thread can hand it to the render thread
+Snapshot = namedtuple('Snapshot', 'frame scroll_x player enemies coins score')
+
+
+class WorldRenderer:
+    def __init__(self, world):
+        self.world = world
+        # Static blocks pre-rendered in column chunks; pipes are drawn over
+        # the moving entities each frame, as in the original draw order
+        self.terrain_cache = ChunkCache(self.render_terrain_chunk, SCREEN_HEIGHT)
+        self.motion = Interpolator()
+
+    def remember(self):
+        """Call before each step when drawing with alpha < 1."""
+        world = self.world
+        goombas = world.goombas
+        self.motion.remember([world.player], scroll_x=world.scroll_x)
+        self.motion.remember_points(zip(goombas.ids[:len(goombas)].tolist(), goombas['pos'].tolist()))
+
+    def render_terrain_chunk(self, surface, left):
+        world = self.world
+        surface.fill(COLOR_BG)
+        right = left + surface.get_width()
+        for p in world.platform_index.visible(left, right):
+            pygame.draw.rect(surface, p.color, (p.rect.x - left, p.rect.y, p.rect.width, p.rect.height))
+
+    def snapshot(self):
+        """Capture the moving parts of the current view (see pipeline.py)."""
+        world = self.world
+        scroll_x = world.scroll_x
+        view_left, view_right = scroll_x, scroll_x + SCREEN_WIDTH
+        return Snapshot(
+            world.frame, scroll_x, tuple(world.player.rect),
+            tuple((x, y, w, h) for _, x, y, w, h in self.visible_goombas(view_left, view_right)),
+            tuple(tuple(c.rect) for c in world.coins.visible(view_left, view_right)),
+            world.player.score,
+        )
+
+    def visible_goombas(self, left, right):
+        """(id, x, y, w, h) of the Goombas overlapping the columns [left, right)."""
+        goombas = self.world.goombas
+        rows = visible(goombas, left, right)
+        return zip(goombas.ids[rows].tolist(), *goombas['pos'][rows].T.tolist(), *goombas['size'][rows].T.tolist())
+
+    def draw(self, screen, alpha=1.0):
+        """Draw only what is inside the camera view, alpha of the way from the previous step."""
+        world, player, motion = self.world, self.world.player, self.motion
+        scroll_x = motion.value('scroll_x', world.scroll_x, alpha)
+        view_left, view_right = scroll_x, scroll_x + SCREEN_WIDTH
+        enemies = []
+        for goomba, x, y, w, h in self.visible_goombas(view_left, view_right):
+            x, y = motion.point(goomba, x, y, alpha)
+            enemies.append((x, y, w, h))
+        x, y = motion.pos(player, alpha)
+        self.draw_view(screen, scroll_x, (x, y, player.rect.width, player.rect.height),
+                       enemies, [c.rect for c in world.coins.visible(view_left, view_right)])
+
+    def draw_snapshot(self, screen, snapshot):
+        self.draw_view(screen, snapshot.scroll_x, snapshot.player, snapshot.enemies, snapshot.coins)
+
+    def draw_view(self, screen, scroll_x, player, enemies, coins):
+        """Terrain, pipes and flag come from the (static) world, the rest from the arguments."""
+        world = self.world
+        self.terrain_cache.draw(screen, scroll_x)
+        for x, y, w, h in coins:
+            pygame.draw.rect(screen, COLOR_COIN, (x - scroll_x, y, w, h))
+        for x, y, w, h in enemies:
+            pygame.draw.rect(screen, COLOR_GOOMBA, (x - scroll_x, y, w, h))
+        for p in world.pipe_index.visible(scroll_x, scroll_x + SCREEN_WIDTH):
+            p.draw(screen, scroll_x)
+        flag = world.flag
+        if flag:
+            pygame.draw.rect(screen, COLOR_FLAGPOLE, (flag.pole.x - scroll_x, flag.pole.y, flag.pole.width, flag.pole.height))
+            pygame.draw.rect(screen, COLOR_FLAG, (flag.flag.x - scroll_x, flag.flag.y, flag.flag.width, flag.flag.height))
+        x, y, w, h = player
+        pygame.draw.rect(screen, COLOR_PLAYER, (x - scroll_x, y, w, h))
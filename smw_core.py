@@ -0,0 +1,184 @@
+# Headless game core for the Super Mario World clones (GPT4.5Mario4k1.04.27.251.0.py
+# and SMMADVANCEESMW4K.py). Runs without a window; the scripts load sprites
+# and draw a World, and tools can drive step() directly with input bitmasks.
+import pygame
+from collectibles import Collectibles
+from frametime import phase
+from inputs import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 256, 224
+COLOR_SKY = (92, 148, 252)  # SMW sky blue
+
+# Animation frames per entity (the sprite sheets are generated to match)
+PLAYER_FRAMES = 4  # walk cycle
+ENEMY_FRAMES = 2   # wiggle
+COIN_FRAMES = 4    # spin
+
+SPAWN_X, SPAWN_Y = 16, 16
+
+# Game entities
+class Player:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 16, 16)
+        self.vx, self.vy = 0, 0
+        self.speed = 2
+        self.jump_power = -8
+        self.gravity = 0.4
+        self.on_ground = False
+        self.score = 0
+        self.frame = 0
+        self.frame_timer = 0
+        self.frame_speed = 0.1  # Frames per second per update
+
+    def update(self, platforms, inputs):
+        self.vx = 0
+        if inputs & INPUT_LEFT:
+            self.vx = -self.speed
+        if inputs & INPUT_RIGHT:
+            self.vx = self.speed
+        if inputs & INPUT_JUMP and self.on_ground:
+            self.vy = self.jump_power
+            self.on_ground = False
+
+        self.vy += self.gravity
+        self.rect.x += self.vx
+        self.collide(self.vx, 0, platforms)
+        self.rect.y += self.vy
+        self.on_ground = False
+        self.collide(0, self.vy, platforms)
+
+        # Animate if moving
+        if self.vx != 0 or not self.on_ground:
+            self.frame_timer += self.frame_speed
+            if self.frame_timer >= 1:
+                self.frame = (self.frame + 1) % PLAYER_FRAMES
+                self.frame_timer = 0
+        else:
+            self.frame = 0  # Idle frame
+
+        if self.rect.y > SCREEN_HEIGHT:
+            self.rect.x, self.rect.y = SPAWN_X, SPAWN_Y
+            self.vx, self.vy = 0, 0
+
+    def collide(self, dx, dy, platforms):
+        for p in platforms:
+            if self.rect.colliderect(p.rect):
+                if dx > 0:
+                    self.rect.right = p.rect.left
+                if dx < 0:
+                    self.rect.left = p.rect.right
+                if dy > 0:
+                    self.rect.bottom = p.rect.top
+                    self.vy = 0
+                    self.on_ground = True
+                if dy < 0:
+                    self.rect.top = p.rect.bottom
+                    self.vy = 0
+
+    def sprite(self):
+        return ('player', self.frame), (self.rect.x, self.rect.y)
+
+class Platform:
+    def __init__(self, x, y, width=32, height=8):
+        self.rect = pygame.Rect(x, y, width, height)
+
+    def sprite(self):
+        return ('platform', 0), (self.rect.x, self.rect.y)
+
+class Enemy:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 16, 16)
+        self.vx = -1
+        self.frame = 0
+        self.frame_timer = 0
+        self.frame_speed = 0.05
+
+    def update(self):
+        self.rect.x += self.vx
+        if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
+            self.vx = -self.vx
+        # Animate
+        self.frame_timer += self.frame_speed
+        if self.frame_timer >= 1:
+            self.frame = (self.frame + 1) % ENEMY_FRAMES
+            self.frame_timer = 0
+
+    def sprite(self):
+        return ('enemy', self.frame), (self.rect.x, self.rect.y)
+
+class Coin:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 8, 8)
+        self.frame = 0
+        self.frame_timer = 0
+        self.frame_speed = 0.15
+
+    def update(self):
+        # Animate
+        self.frame_timer += self.frame_speed
+        if self.frame_timer >= 1:
+            self.frame = (self.frame + 1) % COIN_FRAMES
+            self.frame_timer = 0
+
+    def sprite(self):
+        return ('coin', self.frame), (self.rect.x, self.rect.y)
+
+class Goal:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 16, 32)
+
+    def sprite(self):
+        return ('goal', 0), (self.rect.x, self.rect.y)
+
+# All mutable game state for one run of the level
+class World:
+    def __init__(self, enemy_respawns=False):
+        # Touching an enemy costs 10 points and stops the player; with
+        # enemy_respawns (SMMADVANCEESMW4K.py) it also sends them back to spawn
+        self.enemy_respawns = enemy_respawns
+
+        # Level setup
+        self.player = Player(SPAWN_X, SPAWN_Y)
+        self.platforms = [
+            Platform(0, 200, 256, 8),  # Ground
+            Platform(80, 160, 64, 8),
+            Platform(150, 120, 64, 8),
+        ]
+        self.enemies = [Enemy(100, 184), Enemy(180, 104)]
+        self.coins = Collectibles([Coin(90, 140), Coin(160, 100), Coin(200, 100)])
+        self.goal = Goal(220, 168)
+        self.frame = 0
+        self.complete = False
+
+def step(world, inputs):
+    """Advance the world by one frame; returns False once the goal is reached."""
+    player = world.player
+    phase('player')
+    player.update(world.platforms, inputs)
+
+    phase('entities')
+    for enemy in world.enemies:
+        enemy.update()
+    for coin in world.coins:
+        coin.update()
+    for coin in world.coins.collect(player.rect):
+        player.score += 10
+    if player.rect.colliderect(world.goal.rect):
+        world.complete = True
+
+    for enemy in world.enemies:
+        if player.rect.colliderect(enemy.rect):
+            if world.enemy_respawns:
+                player.rect.x, player.rect.y = SPAWN_X, SPAWN_Y
+            player.vx, player.vy = 0, 0
+            player.score = max(0, player.score - 10)
+
+    world.frame += 1
+    return not world.complete
+
+def run(world, input_sequence):
+    """Step through a sequence of input bitmasks until it ends or the goal is reached."""
+    for inputs in input_sequence:
+        if not step(world, inputs):
+            break
+    return world
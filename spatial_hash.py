@@ -0,0 +1,56 @@
+# Uniform spatial hash broadphase. Objects are bucketed by the grid cells
+# their .rect covers, so a query only looks at objects near the query rect.
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.buckets = {}
+        self.entries = {}  # obj -> (cells, insertion order)
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, obj):
+        return obj in self.entries
+
+    def cells_for(self, rect):
+        size = self.cell_size
+        col0, col1 = rect.left // size, (rect.right - 1) // size
+        row0, row1 = rect.top // size, (rect.bottom - 1) // size
+        return [(col, row) for col in range(col0, col1 + 1) for row in range(row0, row1 + 1)]
+
+    def insert(self, obj):
+        if obj in self.entries:
+            self.remove(obj)
+        cells = self.cells_for(obj.rect)
+        for cell in cells:
+            self.buckets.setdefault(cell, []).append(obj)
+        self.entries[obj] = (cells, self.counter)
+        self.counter += 1
+
+    def remove(self, obj):
+        cells, _ = self.entries.pop(obj)
+        for cell in cells:
+            bucket = self.buckets[cell]
+            bucket.remove(obj)
+            if not bucket:
+                del self.buckets[cell]
+
+    def move(self, obj):
+        """Re-bucket obj after its rect has changed."""
+        order = self.entries[obj][1]
+        self.remove(obj)
+        cells = self.cells_for(obj.rect)
+        for cell in cells:
+            self.buckets.setdefault(cell, []).append(obj)
+        self.entries[obj] = (cells, order)
+
+    def query(self, rect):
+        """Return objects colliding with rect, in insertion order."""
+        found = set()
+        for cell in self.cells_for(rect):
+            for obj in self.buckets.get(cell, ()):
+                if obj not in found and rect.colliderect(obj.rect):
+                    found.add(obj)
+        entries = self.entries
+        return sorted(found, key=lambda obj: entries[obj][1])
@@ -0,0 +1,180 @@
+import mmap
+import os
+import random
+import struct
+
+import pygame
+
+# On-disk cache of generated sprite data, one file per (width, height, frames, seed)
+SPRITE_CACHE_DIR = os.environ.get(
+    'TEAMFLAMES_SPRITE_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sprite_cache'),
+)
+CACHE_MAGIC = b'TFSP'
+CACHE_HEADER = struct.Struct('<4sHHHq')  # magic, width, height, frames, seed
+
+# Open cache mappings; they stay mapped while frame views point into them
+_mapped = {}
+
+
+def generate_sprite_frames(width, height, frames=1, seed=None):
+    """Generate multiple frames of synthetic grayscale pixel data.
+
+    Uses a private RNG, so the global random module is left untouched and the
+    result only depends on the seed.
+    """
+    rng = random.Random(seed)
+    sprite_frames = []
+    for _ in range(frames):
+        data = bytearray()
+        for _ in range(width * height):
+            value = rng.randint(0, 255) if rng.random() > 0.3 else 0
+            data.append(value)
+        sprite_frames.append(data)
+    return sprite_frames
+
+
+def generate_sprite_data(width, height, frames=1, seed=None):
+    """Return sprite frames for a seed, from the on-disk cache when possible.
+
+    Cached frames are zero-copy memoryviews into a read-only mmap.
+    """
+    if not isinstance(seed, int):
+        return generate_sprite_frames(width, height, frames, seed)
+    header = (CACHE_MAGIC, width, height, frames, seed)
+    try:
+        CACHE_HEADER.pack(*header)
+    except struct.error:
+        # Sizes or seed too large for a cache header: generate, don't cache
+        return generate_sprite_frames(width, height, frames, seed)
+    path = os.path.join(SPRITE_CACHE_DIR, f'{width}x{height}x{frames}-{seed}.bin')
+    views = _load_cached(path, header)
+    if views is not None:
+        return views
+    sprite_frames = generate_sprite_frames(width, height, frames, seed)
+    _store_cached(path, header, sprite_frames)
+    return sprite_frames
+
+
+def _load_cached(path, header):
+    mapped = _mapped.get(path)
+    if mapped is None:
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+    _, width, height, frames, _ = header
+    size = width * height
+    if len(mapped) != CACHE_HEADER.size + size * frames or CACHE_HEADER.unpack_from(mapped) != header:
+        if path not in _mapped:
+            mapped.close()
+        return None
+    _mapped[path] = mapped
+    view = memoryview(mapped)
+    offset = CACHE_HEADER.size
+    return [view[offset + i * size:offset + (i + 1) * size] for i in range(frames)]
+
+
+def _store_cached(path, header, sprite_frames):
+    # Best effort: a read-only or full disk just means a cold start next time
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(SPRITE_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(CACHE_HEADER.pack(*header))
+            for data in sprite_frames:
+                f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_sprite_frames(data_list, width, height):
+    """Convert list of grayscale frame data to list of Pygame surfaces."""
+    surfaces = []
+    for data in data_list:
+        # Expand each gray byte v into (v, v, v) with three strided slice
+        # copies; 0 maps to (0, 0, 0), i.e. black, without a per-pixel branch.
+        rgb = bytearray(width * height * 3)
+        rgb[0::3] = data
+        rgb[1::3] = data
+        rgb[2::3] = data
+        surface = pygame.Surface((width, height))
+        surface.blit(pygame.image.frombuffer(rgb, (width, height), 'RGB'), (0, 0))
+        surfaces.append(surface)
+    return surfaces
+
+
+def load_sprite(data, width, height):
+    return load_sprite_frames([data], width, height)[0]
+
+
+def load_sprite_frames_reference(data_list, width, height):
+    """Per-pixel set_at() decoder, kept as the reference for load_sprite_frames()."""
+    surfaces = []
+    for data in data_list:
+        surface = pygame.Surface((width, height))
+        for y in range(height):
+            for x in range(width):
+                idx = x + y * width
+                value = data[idx]
+                color = (value, value, value) if value > 0 else (0, 0, 0)
+                surface.set_at((x, y), color)
+        surfaces.append(surface)
+    return surfaces
+
+
+# Packs many small frames into one Surface (simple shelf packing) and hands
+# out rect/subsurface views keyed by (entity, frame). Drawing goes through a
+# single source surface with one blits() call per batch.
+class SpriteAtlas:
+    def __init__(self, max_width=256):
+        self.max_width = max_width
+        self.pending = {}
+        self.rects = {}
+        self.views = {}
+        self.surface = None
+
+    def add(self, key, surface):
+        self.pending[key] = surface
+
+    def add_frames(self, entity, surfaces):
+        for frame, surface in enumerate(surfaces):
+            self.add((entity, frame), surface)
+
+    def build(self):
+        # Tallest first, filling left-to-right shelves
+        order = sorted(self.pending, key=lambda key: -self.pending[key].get_height())
+        x = y = shelf_height = width = 0
+        for key in order:
+            w, h = self.pending[key].get_size()
+            if x + w > self.max_width and x > 0:
+                y += shelf_height
+                x = shelf_height = 0
+            self.rects[key] = pygame.Rect(x, y, w, h)
+            x += w
+            width = max(width, x)
+            shelf_height = max(shelf_height, h)
+        self.surface = pygame.Surface((max(width, 1), max(y + shelf_height, 1)))
+        self.surface.blits([(self.pending[key], self.rects[key]) for key in order], doreturn=False)
+        self.pending = {}
+        self.views = {}
+        return self.surface
+
+    def rect(self, key):
+        return self.rects[key]
+
+    def subsurface(self, key):
+        view = self.views.get(key)
+        if view is None:
+            view = self.views[key] = self.surface.subsurface(self.rects[key])
+        return view
+
+    def draw(self, screen, sprites, doreturn=False):
+        """Blit (key, position) pairs from the atlas in one batch."""
+        source, rects = self.surface, self.rects
+        return screen.blits([(source, pos, rects[key]) for key, pos in sprites], doreturn=doreturn)
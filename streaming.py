@@ -0,0 +1,180 @@
+# Streaming version of smb1_core.World for very long or endless levels.
+# Columns are pulled from a generator just ahead of the camera and built in
+# chunks; chunks that scroll off the left edge are freed, so memory stays
+# bounded by the view. As in SMB1 the camera only moves right: the player is
+# held at the left edge of the view, and a death restarts the stream from the
+# first column. Score and deaths carry over, and so do collected coins and
+# stomped Goombas: they are remembered by tile and not loaded again.
+import itertools
+from collections import deque
+
+import smb1_core
+from collectibles import Collectibles
+from culling import XIndex
+from ecs import EntityStore
+from level_format import LevelFile, level_columns
+from smb1_core import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, BLOCK_COLORS, Player, Platform, Coin, Pipe, Flag, level_1_1, spawn_goombas
+from tilegrid import ColumnGrid, merge_tiles
+
+CHUNK_COLUMNS = 16
+# Pipes overhang the column they start in
+EVICT_MARGIN = TILE_SIZE * 2
+
+
+# The static pieces built from one run of columns
+class Chunk:
+    def __init__(self, first_col, last_col):
+        self.first_col = first_col
+        self.last_col = last_col  # exclusive
+        self.platforms = []
+        self.pipes = []
+        self.coins = []
+
+    @property
+    def right(self):
+        return self.last_col * TILE_SIZE
+
+
+class StreamingWorld:
+    """Drop-in for smb1_core.World (without savestates).
+
+    level_data is a list of ASCII rows, a LevelFile, or a zero-argument
+    callable returning a fresh column generator (see level_columns()); the
+    callable form needs rows and can be endless.
+    """
+    def __init__(self, level_data=level_1_1, rows=None, ahead=SCREEN_WIDTH * 2, chunk_columns=CHUNK_COLUMNS):
+        if callable(level_data):
+            self.source = level_data
+        else:
+            self.source = lambda: level_columns(level_data)
+            rows = level_data.rows if isinstance(level_data, LevelFile) else len(level_data)
+        self.rows = rows
+        self.ahead = ahead
+        self.chunk_columns = chunk_columns
+        self.player = Player(TILE_SIZE * 2, SCREEN_HEIGHT - TILE_SIZE * 3)
+        self.frame = 0
+        self.complete = False
+        self.taken = set()  # (col, row) of coins and Goombas already removed
+        self.restart()
+
+    def restart(self):
+        """Start streaming again from the first column."""
+        self.columns = self.source()
+        self.next_col = 0
+        self.exhausted = False
+        self.chunks = deque()
+        self.grid = ColumnGrid(self.rows, TILE_SIZE)
+        self.platform_index = XIndex()
+        self.pipe_index = XIndex()
+        self.store = EntityStore()
+        spawn_goombas(self.store, [])
+        self.goombas = self.store['goomba']
+        self.coins = Collectibles()
+        # Loaded coins and Goomba ids -> (col, row)
+        self.coin_keys = {}
+        self.goomba_keys = {}
+        self.flag = None
+        self.scroll_x = 0
+        self.stream()
+
+    def stream(self):
+        """Load columns up to `ahead` past the camera and free those behind it."""
+        while not self.exhausted and self.next_col * TILE_SIZE < self.scroll_x + self.ahead:
+            self.load_chunk()
+
+        while self.chunks and self.chunks[0].right + EVICT_MARGIN <= self.scroll_x:
+            self.evict_chunk(self.chunks.popleft())
+
+        goombas = self.goombas
+        gone = goombas.ids[:len(goombas)][goombas['pos'][:, 0] + goombas['size'][:, 0] <= self.scroll_x]
+        if len(gone):
+            self.store.despawn_many(gone)
+            for goomba in gone.tolist():
+                del self.goomba_keys[goomba]
+
+    def record_taken(self):
+        """Remember the coins and Goombas the last step removed."""
+        for keys, present in ((self.coin_keys, self.coins), (self.goomba_keys, self.store)):
+            for entity, key in list(keys.items()):
+                if entity not in present:
+                    self.taken.add(key)
+                    del keys[entity]
+
+    def load_chunk(self):
+        columns = list(itertools.islice(self.columns, self.chunk_columns))
+        if not columns:
+            self.exhausted = True
+            return
+        chunk = Chunk(columns[0][0], columns[-1][0] + 1)
+        kinds = {}
+        entities = []
+        for col, blocks, found in columns:
+            for row, tile in blocks:
+                kinds[(col, row)] = BLOCK_COLORS[tile]
+            entities.extend((row, col, kind, param) for row, kind, param in found)
+
+        for x, y, w, h, color in merge_tiles(kinds):
+            platform = Platform(x * TILE_SIZE, y * TILE_SIZE, w * TILE_SIZE, h * TILE_SIZE, color)
+            chunk.platforms.append(platform)
+            self.grid.fill(x, y, w, h, platform)
+            self.platform_index.add(platform)
+
+        # Row-major within the chunk, like generate_world()
+        goombas = []
+        for y, x, kind, param in sorted(entities):
+            pos_x = x * TILE_SIZE
+            pos_y = y * TILE_SIZE
+            if kind in 'CG' and (x, y) in self.taken:
+                continue
+            if kind == 'C':
+                coin = Coin(pos_x, pos_y)
+                chunk.coins.append(coin)
+                self.coins.add(coin)
+                self.coin_keys[coin] = (x, y)
+            elif kind == 'G':
+                goombas.append(((pos_x, pos_y), (x, y)))
+            elif kind == 'P':
+                pipe = Pipe(pos_x, pos_y, param)
+                chunk.pipes.append(pipe)
+                self.pipe_index.add(pipe)
+            elif kind == 'F':
+                self.flag = Flag(pos_x, pos_y)
+        if goombas:
+            ids = spawn_goombas(self.store, [pos for pos, _ in goombas])
+            self.goomba_keys.update(zip(ids.tolist(), (key for _, key in goombas)))
+
+        self.chunks.append(chunk)
+        self.next_col = chunk.last_col
+
+    def evict_chunk(self, chunk):
+        self.grid.drop(chunk.first_col, chunk.last_col)
+        for platform in chunk.platforms:
+            self.platform_index.remove(platform)
+        for pipe in chunk.pipes:
+            self.pipe_index.remove(pipe)
+        for coin in chunk.coins:
+            if coin in self.coins:
+                self.coins.remove(coin)
+                del self.coin_keys[coin]
+
+
+def step(world, inputs):
+    """smb1_core.step() for a StreamingWorld; also loads and frees columns."""
+    player = world.player
+    deaths, coins, goombas = player.deaths, len(world.coins), len(world.goombas)
+    running = smb1_core.step(world, inputs)
+    if len(world.coins) != coins or len(world.goombas) != goombas:
+        world.record_taken()
+    if player.deaths != deaths:
+        world.restart()
+    elif player.rect.left < world.scroll_x:
+        player.rect.left = world.scroll_x
+    world.stream()
+    return running
+
+
+def run(world, input_sequence):
+    for inputs in input_sequence:
+        if not step(world, inputs):
+            break
+    return world
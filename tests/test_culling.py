@@ -0,0 +1,40 @@
+import random
+
+import pygame
+
+from culling import XIndex
+
+
+class Thing:
+    def __init__(self, x, width=16):
+        self.rect = pygame.Rect(x, 0, width, 16)
+
+
+def brute_visible(things, left, right):
+    return {t for t in things if t.rect.right > left and t.rect.left < right}
+
+
+def test_refresh_after_moves_matches_rebuild():
+    rng = random.Random(1)
+    walkers = [Thing(rng.randrange(0, 4000)) for _ in range(300)]
+    walls = [Thing(rng.randrange(0, 4000), rng.randrange(300, 900)) for _ in range(10)]
+    index = XIndex(walkers + walls)
+    for _ in range(200):
+        for t in walkers:
+            t.rect.x += rng.choice((-3, -1, 0, 1, 3))
+        index.moved()
+        left = rng.randrange(0, 4000)
+        assert set(index.visible(left, left + 256)) == brute_visible(walkers + walls, left, left + 256)
+    assert index.keys == sorted(index.keys)
+
+
+def test_remove_and_add_while_stale():
+    things = [Thing(x * 10) for x in range(50)]
+    index = XIndex(things)
+    for t in things:
+        t.rect.x += 25
+    index.moved()
+    index.remove(things[10])
+    index.add(Thing(5))
+    assert len(index) == 50
+    assert set(index.visible(0, 600)) == brute_visible(set(index.slots), 0, 600)
@@ -0,0 +1,33 @@
+import pytest
+
+from ecs import EntityStore
+
+
+def make_store(count):
+    store = EntityStore()
+    store.archetype('goomba', ('pos', 'vel', 'size'))
+    ids = store.spawn_many('goomba', count, pos=[(i, 0) for i in range(count)])
+    return store, ids
+
+
+def test_never_spawned_ids_are_rejected():
+    store, _ = make_store(10)
+    for entity in (10, 20, 63):
+        assert entity not in store
+        with pytest.raises(KeyError):
+            store.despawn(entity)
+        with pytest.raises(KeyError):
+            store.get(entity, 'pos')
+    assert len(store) == 10
+    assert list(store.get(0, 'pos')) == [0, 0]
+
+
+def test_despawn_keeps_other_entities_addressable():
+    store, ids = make_store(100)
+    for entity in ids[::3]:
+        store.despawn(int(entity))
+    for entity in ids:
+        if entity % 3:
+            assert store.get(int(entity), 'pos')[0] == entity
+        else:
+            assert entity not in store
@@ -0,0 +1,22 @@
+from level_format import LevelFile, save_level
+from levelgen import generate_level
+from smb1_core import World, level_1_1
+
+
+def world_layout(world):
+    return (
+        [(tuple(p.rect), p.color) for p in world.platforms],
+        [tuple(c.rect) for c in world.coins],
+        world.goombas['pos'].tolist(),
+        [tuple(p.rect) for p in world.pipes],
+        tuple(world.flag.pole) if world.flag else None,
+        [[tuple(t.rect) if t else None for t in row] for row in world.grid.cells],
+    )
+
+
+def test_compiled_level_builds_same_world(tmp_path):
+    for level in (level_1_1, generate_level(500, seed=3)):
+        path = tmp_path / 'level.tflv'
+        save_level(level, path)
+        with LevelFile(path) as compiled:
+            assert world_layout(World(compiled)) == world_layout(World(level))
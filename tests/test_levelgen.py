@@ -0,0 +1,11 @@
+from levelgen import GROUND_ROWS, generate_level, validate_level
+
+
+def test_flag_stands_on_solid_ground():
+    for seed in range(20):
+        level = generate_level(200, seed)
+        validate_level(level)
+        row = next(y for y, tiles in enumerate(level) if 'F' in tiles)
+        col = level[row].index('F')
+        assert row < GROUND_ROWS[0]
+        assert all(level[y][col] == '#' for y in GROUND_ROWS)
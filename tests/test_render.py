@@ -0,0 +1,40 @@
+import pygame
+
+from smb1_core import (SCREEN_WIDTH, SCREEN_HEIGHT, COLOR_BG, COLOR_COIN, COLOR_GOOMBA, COLOR_PLAYER,
+                       COLOR_FLAGPOLE, COLOR_FLAG, World, step, level_1_1)
+from inputs import INPUT_RIGHT, INPUT_JUMP
+from smb1_render import WorldRenderer
+
+
+def draw_reference(screen, world):
+    # The original full-level draw loop of $TEAMFLAMESHDRSMB1-1.py
+    scroll_x, player, flag = world.scroll_x, world.player, world.flag
+    screen.fill(COLOR_BG)
+    for p in world.platforms:
+        pygame.draw.rect(screen, p.color, (p.rect.x - scroll_x, p.rect.y, p.rect.width, p.rect.height))
+    for c in world.coins:
+        pygame.draw.rect(screen, COLOR_COIN, (c.rect.x - scroll_x, c.rect.y, c.rect.width, c.rect.height))
+    for x, y in world.goombas['pos'].tolist():
+        pygame.draw.rect(screen, COLOR_GOOMBA, (x - scroll_x, y, 16, 16))
+    for p in world.pipes:
+        p.draw(screen, scroll_x)
+    if flag:
+        pygame.draw.rect(screen, COLOR_FLAGPOLE, (flag.pole.x - scroll_x, flag.pole.y, flag.pole.width, flag.pole.height))
+        pygame.draw.rect(screen, COLOR_FLAG, (flag.flag.x - scroll_x, flag.flag.y, flag.flag.width, flag.flag.height))
+    pygame.draw.rect(screen, COLOR_PLAYER, (player.rect.x - scroll_x, player.rect.y, player.rect.width, player.rect.height))
+
+
+def test_renderer_matches_original_draw_order():
+    world = World(level_1_1)
+    # Walk the Goomba across the first pipe
+    pipe = world.pipes[0]
+    world.goombas['pos'][0] = (pipe.rect.right + 120, pipe.rect.top + 8 - 16)
+    renderer = WorldRenderer(world)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    expected = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for frame in range(900):
+        renderer.draw(screen)
+        draw_reference(expected, world)
+        assert pygame.image.tobytes(screen, 'RGB') == pygame.image.tobytes(expected, 'RGB'), frame
+        if not step(world, INPUT_RIGHT | (INPUT_JUMP if frame % 50 < 20 else 0)):
+            break
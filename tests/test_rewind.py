@@ -0,0 +1,41 @@
+import random
+
+from rewind import RewindBuffer, xor_delta, apply_delta
+
+
+def random_states(size, count, seed=0):
+    rng = random.Random(seed)
+    state = bytearray(rng.randbytes(size))
+    for _ in range(count):
+        for _ in range(8):
+            state[rng.randrange(size)] = rng.randrange(256)
+        yield bytes(state)
+
+
+def test_delta_round_trip_beyond_64k():
+    base, state = random_states(76 * 1024, 2)
+    assert apply_delta(base, xor_delta(base, state)) == state
+
+
+def test_push_pop_large_states():
+    states = list(random_states(76 * 1024, 30))
+    rewind = RewindBuffer(keyframe_interval=10, max_bytes=1 << 24)
+    for state in states:
+        rewind.push(state)
+    assert [rewind.pop() for _ in states] == states[::-1]
+    assert rewind.pop() is None
+
+
+def test_frame_limit_includes_newest_group():
+    rewind = RewindBuffer(seconds=0.25, fps=60)
+    for state in random_states(64, 200):
+        rewind.push(state)
+        assert len(rewind) <= rewind.max_frames == 15
+
+
+def test_byte_budget_starts_keyframes_early():
+    rewind = RewindBuffer(keyframe_interval=60, max_bytes=4096)
+    for state in random_states(1024, 200):
+        rewind.push(state)
+        assert rewind.bytes <= rewind.max_bytes
+        assert len(rewind) >= 1
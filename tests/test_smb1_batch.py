@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+import pytest
+
+from levelgen import generate_level
+from smb1_batch import BatchWorld
+from smb1_core import World, step, level_1_1
+
+INPUT_CHOICES = (0, 1, 2, 2, 2, 16, 18, 18, 17)
+
+
+def random_inputs(rng, count, frames):
+    # Inputs are held for a few frames, like a player would
+    held = [rng.choice(INPUT_CHOICES) for _ in range(count)]
+    for _ in range(frames):
+        for i in range(count):
+            if rng.random() < 0.1:
+                held[i] = rng.choice(INPUT_CHOICES)
+        yield list(held)
+
+
+def scalar_state(world):
+    player = world.player
+    return (player.rect.x, player.rect.y, player.score, player.deaths, world.scroll_x, world.complete)
+
+
+def batch_state(batch, i):
+    return (int(batch.x[i]), int(batch.y[i]), int(batch.score[i]), int(batch.deaths[i]),
+            int(batch.scroll_x[i]), bool(batch.complete[i]))
+
+
+@pytest.mark.parametrize('level', [level_1_1, generate_level(300, seed=5)], ids=['level_1_1', 'generated'])
+def test_batch_matches_scalar_core(level):
+    count, frames = 48, 1500
+    worlds = [World(level) for _ in range(count)]
+    batch = BatchWorld(count, level)
+    for inputs in random_inputs(random.Random(7), count, frames):
+        batch.step(np.array(inputs))
+        for i, world in enumerate(worlds):
+            if not world.complete:
+                step(world, inputs[i])
+            assert scalar_state(world) == batch_state(batch, i)
+
+    for i, world in enumerate(worlds):
+        assert [c in world.coins for c in world.all_coins] == batch.coin_alive[i].tolist()
+        goombas = range(len(world.goomba_spawns))
+        assert [g in world.store for g in goombas] == batch.goomba_alive[i].tolist()
+        # Stomped Goombas keep walking in the batch, but nothing reads them
+        alive = batch.goomba_alive[i]
+        assert [int(world.store.get(g, 'pos')[0]) for g in goombas if g in world.store] == \
+            batch.goomba_x[i][alive].tolist()
@@ -0,0 +1,34 @@
+import pygame
+import pytest
+
+import sprites
+from sprites import generate_sprite_data, generate_sprite_frames, load_sprite_frames, load_sprite_frames_reference
+
+
+def surface_bytes(surfaces):
+    return [pygame.image.tobytes(surface, 'RGB') for surface in surfaces]
+
+
+@pytest.mark.parametrize('width, height', [(16, 16), (8, 8), (16, 32), (32, 8)])
+def test_bulk_decoder_matches_reference(width, height):
+    frames = generate_sprite_frames(width, height, frames=4, seed=width * height)
+    frames += [bytearray(width * height), bytearray(b'\xff' * (width * height))]
+    assert surface_bytes(load_sprite_frames(frames, width, height)) == \
+        surface_bytes(load_sprite_frames_reference(frames, width, height))
+
+
+def test_bulk_decoder_matches_reference_on_cached_views(tmp_path, monkeypatch):
+    monkeypatch.setattr(sprites, 'SPRITE_CACHE_DIR', str(tmp_path))
+    generate_sprite_data(16, 16, frames=4, seed=1)
+    frames = generate_sprite_data(16, 16, frames=4, seed=1)
+    assert all(isinstance(frame, memoryview) for frame in frames)
+    assert surface_bytes(load_sprite_frames(frames, 16, 16)) == \
+        surface_bytes(load_sprite_frames_reference(frames, 16, 16))
+
+
+@pytest.mark.parametrize('width, height, frames, seed', [(4, 4, 1, 2**64), (4, 4, 1, -2**63 - 1), (65536, 1, 1, 0)])
+def test_keys_outside_the_cache_header_are_generated_uncached(tmp_path, monkeypatch, width, height, frames, seed):
+    monkeypatch.setattr(sprites, 'SPRITE_CACHE_DIR', str(tmp_path))
+    frames_data = generate_sprite_data(width, height, frames=frames, seed=seed)
+    assert frames_data == generate_sprite_frames(width, height, frames, seed)
+    assert list(tmp_path.iterdir()) == []
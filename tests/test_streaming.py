@@ -0,0 +1,24 @@
+from smb1_core import level_1_1
+from streaming import StreamingWorld, step
+
+
+def test_collected_coins_and_stomped_goombas_stay_gone_after_death():
+    world = StreamingWorld(level_1_1)
+    player = world.player
+    coins, goombas = len(world.coins), len(world.goombas)
+
+    player.rect.topleft = next(iter(world.coins)).rect.topleft
+    step(world, 0)
+    x, y = world.goombas['pos'][0].tolist()
+    player.rect.midbottom = (x + 8, y)
+    player.rect.y += 2
+    player.vy = 1
+    step(world, 0)
+    assert player.score == 300
+
+    player.rect.y = 1000  # fall out of the level
+    step(world, 0)
+    assert player.deaths == 1
+    assert len(world.coins) == coins - 1
+    assert len(world.goombas) == goombas - 1
+    assert player.score == 300
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from timestep import FixedTimestep
+
+
+class FakeClock:
+    def __init__(self, advance=0.0):
+        self.now = 0.0
+        self.advance = advance  # added after every read
+
+    def __call__(self):
+        now = self.now
+        self.now += self.advance
+        return now
+
+
+def test_first_fixed_frame_runs_one_step():
+    clock = FakeClock()
+    timestep = FixedTimestep(rate=64, mode='fixed', clock=clock)
+    assert len(list(timestep.steps())) == 1
+    assert timestep.alpha == 0.0
+
+
+def test_long_stall_runs_max_steps_and_drops_the_rest():
+    clock = FakeClock()
+    timestep = FixedTimestep(rate=64, mode='fixed', max_steps=5, clock=clock)
+    list(timestep.steps())
+    clock.now += 10.5 * timestep.dt
+    assert len(list(timestep.steps())) == 5
+    assert timestep.dropped == 5
+    assert timestep.alpha == pytest.approx(0.5)
+
+
+def test_alpha_stays_between_0_and_1():
+    clock = FakeClock()
+    timestep = FixedTimestep(rate=60, mode='fixed', clock=clock)
+    frame_times = random.Random(0)
+    for _ in range(1000):
+        clock.now += frame_times.uniform(0, 0.2)
+        list(timestep.steps())
+        assert 0.0 <= timestep.alpha <= 1.0
+
+
+def test_turbo_returns_once_past_its_deadline():
+    clock = FakeClock(advance=1 / 128)
+    timestep = FixedTimestep(mode='turbo', render_fps=16, clock=clock)
+    steps = 0
+    for _ in timestep.steps():
+        steps += 1
+        assert steps <= 8
+    assert steps == 8
@@ -0,0 +1,132 @@
+# 2D grid of solid tiles, indexed [row][col]. Each occupied cell holds the
+# object that owns the tile (anything with a .rect), empty cells hold None.
+# One object may own several cells, e.g. a merged run of ground.
+class TileGrid:
+    def __init__(self, cols, rows, tile_size):
+        self.cols = cols
+        self.rows = rows
+        self.tile_size = tile_size
+        self.cells = [[None] * cols for _ in range(rows)]
+
+    def set(self, col, row, tile):
+        self.cells[row][col] = tile
+
+    def get(self, col, row):
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.cells[row][col]
+        return None
+
+    def clear(self, col, row):
+        self.cells[row][col] = None
+
+    def fill(self, col, row, width, height, tile):
+        for r in range(row, row + height):
+            self.cells[r][col:col + width] = [tile] * width
+
+    def items(self):
+        for row, cells in enumerate(self.cells):
+            for col, tile in enumerate(cells):
+                if tile is not None:
+                    yield col, row, tile
+
+    def query(self, rect):
+        """Return the distinct solid tiles overlapping rect, in row-major order."""
+        size = self.tile_size
+        col0 = max(rect.left // size, 0)
+        col1 = min((rect.right - 1) // size, self.cols - 1)
+        row0 = max(rect.top // size, 0)
+        row1 = min((rect.bottom - 1) // size, self.rows - 1)
+        hits = []
+        for row in range(row0, row1 + 1):
+            cells = self.cells[row]
+            for col in range(col0, col1 + 1):
+                tile = cells[col]
+                if tile is not None and tile not in hits:
+                    hits.append(tile)
+        return hits
+
+
+def merge_tiles(kinds):
+    """Greedily merge same-kind tiles into maximal rectangles.
+
+    kinds maps (col, row) -> kind. Returns (col, row, width, height, kind)
+    tuples in tile units; each run is grown rightward first, then downward.
+    """
+    left = dict(kinds)
+    boxes = []
+    for col, row in sorted(kinds, key=lambda cell: (cell[1], cell[0])):
+        if (col, row) not in left:
+            continue
+        kind = left[(col, row)]
+        width = 1
+        while left.get((col + width, row)) == kind:
+            width += 1
+        height = 1
+        while all(left.get((c, row + height)) == kind for c in range(col, col + width)):
+            height += 1
+        for r in range(row, row + height):
+            for c in range(col, col + width):
+                del left[(c, r)]
+        boxes.append((col, row, width, height, kind))
+    return boxes
+
+
+# Sparse counterpart of TileGrid for streamed levels: only loaded columns are
+# stored (col -> list of rows), and whole columns are dropped once they have
+# scrolled away. Same query() results as TileGrid for the loaded area.
+class ColumnGrid:
+    def __init__(self, rows, tile_size):
+        self.rows = rows
+        self.tile_size = tile_size
+        self.columns = {}
+
+    def __len__(self):
+        return len(self.columns)
+
+    def set(self, col, row, tile):
+        column = self.columns.get(col)
+        if column is None:
+            column = self.columns[col] = [None] * self.rows
+        column[row] = tile
+
+    def get(self, col, row):
+        column = self.columns.get(col)
+        if column is not None and 0 <= row < self.rows:
+            return column[row]
+        return None
+
+    def clear(self, col, row):
+        column = self.columns.get(col)
+        if column is not None:
+            column[row] = None
+
+    def fill(self, col, row, width, height, tile):
+        for c in range(col, col + width):
+            for r in range(row, row + height):
+                self.set(c, r, tile)
+
+    def drop(self, first_col, last_col):
+        """Forget the columns [first_col, last_col)."""
+        for col in range(first_col, last_col):
+            self.columns.pop(col, None)
+
+    def items(self):
+        for col in sorted(self.columns):
+            for row, tile in enumerate(self.columns[col]):
+                if tile is not None:
+                    yield col, row, tile
+
+    def query(self, rect):
+        """Return the distinct solid tiles overlapping rect, in row-major order."""
+        size = self.tile_size
+        cols = [self.columns.get(col) for col in range(rect.left // size, (rect.right - 1) // size + 1)]
+        row0 = max(rect.top // size, 0)
+        row1 = min((rect.bottom - 1) // size, self.rows - 1)
+        hits = []
+        for row in range(row0, row1 + 1):
+            for column in cols:
+                if column is not None:
+                    tile = column[row]
+                    if tile is not None and tile not in hits:
+                        hits.append(tile)
+        return hits
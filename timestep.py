@@ -0,0 +1,129 @@
+# Main-loop scheduling for the pygame clones.
+#
+#   TEAMFLAMES_LOOP=vsync   one simulation step per rendered frame, capped by
+#                           clock.tick() (default; the original behavior)
+#                   fixed   fixed-rate simulation with an accumulator: slow
+#                           frames run several steps (up to a catch-up limit),
+#                           and rendering interpolates between the last two steps
+#                   turbo   step as fast as the CPU allows, rendering about
+#                           TEAMFLAMES_RENDER_FPS times a second
+#   TEAMFLAMES_SIM_RATE=60      simulation steps per second
+#   TEAMFLAMES_MAX_CATCHUP=5    most steps one frame may run in fixed mode
+import os
+import time
+
+LOOP_MODES = ('vsync', 'fixed', 'turbo')
+# Moves longer than this between two steps (respawns, restarts) are drawn
+# at the new position instead of sliding across the screen
+SNAP_DISTANCE = 48
+
+
+class FixedTimestep:
+    def __init__(self, rate=60, mode='vsync', max_steps=5, render_fps=60, clock=time.perf_counter):
+        if mode not in LOOP_MODES:
+            raise ValueError(f"unknown loop mode {mode!r}")
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.mode = mode
+        self.max_steps = max_steps
+        self.render_interval = 1.0 / render_fps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last = None
+        self.dropped = 0  # steps skipped by the catch-up limit
+        self.total_steps = 0
+
+    @classmethod
+    def from_env(cls, rate=60):
+        return cls(
+            rate=int(os.environ.get('TEAMFLAMES_SIM_RATE', rate)),
+            mode=os.environ.get('TEAMFLAMES_LOOP', 'vsync'),
+            max_steps=int(os.environ.get('TEAMFLAMES_MAX_CATCHUP', 5)),
+            render_fps=int(os.environ.get('TEAMFLAMES_RENDER_FPS', 60)),
+        )
+
+    @property
+    def interpolating(self):
+        return self.mode == 'fixed'
+
+    @property
+    def alpha(self):
+        """How far rendering is between the previous and the latest step (0..1)."""
+        if self.mode != 'fixed':
+            return 1.0
+        return min(self.accumulator / self.dt, 1.0)
+
+    def steps(self):
+        """Yield once per simulation step to run this frame."""
+        if self.mode == 'vsync':
+            self.total_steps += 1
+            yield
+            return
+
+        now = self.clock()
+        if self.mode == 'turbo':
+            deadline = now + self.render_interval
+            while True:
+                self.total_steps += 1
+                yield
+                if self.clock() >= deadline:
+                    return
+
+        if self.last is None:
+            self.last = now - self.dt
+        self.accumulator += now - self.last
+        self.last = now
+        count = int(self.accumulator / self.dt)
+        if count > self.max_steps:
+            # Too far behind: run what the limit allows and let the rest go,
+            # rather than falling further behind every frame
+            self.dropped += count - self.max_steps
+            self.accumulator -= (count - self.max_steps) * self.dt
+            count = self.max_steps
+        for _ in range(count):
+            self.accumulator -= self.dt
+            self.total_steps += 1
+            yield
+
+    def tick(self, clock, capped=True):
+        """End-of-frame wait on a pygame Clock; replays that are not capped never wait."""
+        if not capped or self.mode == 'turbo':
+            clock.tick(0)
+        elif self.mode == 'fixed':
+            clock.tick(1.0 / self.render_interval)
+        else:
+            clock.tick(self.rate)
+
+
+# Remembers where moving objects (anything with a .rect) and plain values were
+# before the latest step, so a frame can be drawn between two steps
+class Interpolator:
+    def __init__(self):
+        self.positions = {}
+        self.values = {}
+
+    def remember(self, objects, **values):
+        self.positions = {obj: obj.rect.topleft for obj in objects}
+        self.values = values
+
+    def remember_points(self, points):
+        """Also remember (key, (x, y)) pairs for things without a .rect."""
+        self.positions.update(points)
+
+    def pos(self, obj, alpha):
+        return self.point(obj, *obj.rect.topleft, alpha)
+
+    def point(self, key, x, y, alpha):
+        previous = self.positions.get(key)
+        if alpha >= 1.0 or previous is None:
+            return x, y
+        px, py = previous
+        if abs(x - px) > SNAP_DISTANCE or abs(y - py) > SNAP_DISTANCE:
+            return x, y
+        return round(px + (x - px) * alpha), round(py + (y - py) * alpha)
+
+    def value(self, name, current, alpha):
+        previous = self.values.get(name)
+        if alpha >= 1.0 or previous is None or abs(current - previous) > SNAP_DISTANCE:
+            return current
+        return round(previous + (current - previous) * alpha)